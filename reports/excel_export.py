@@ -2,23 +2,104 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date, datetime
 from pathlib import Path
-from typing import Iterable, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
-import pandas as pd
+import xlsxwriter
+from openpyxl import load_workbook
+
+try:  # pragma: no cover - optional dependency
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception:  # noqa: BLE001
+    pa = None  # type: ignore
+    pq = None  # type: ignore
 
 LOGGER = logging.getLogger(__name__)
 
+RAW_COLUMNS = [
+    "Date",
+    "Activity",
+    "DurationHours",
+    "ObjectivesSucceeded",
+    "TargetHours",
+    "CompletionPercent",
+    "StopReason",
+    "Comments",
+    "PlanTotalHours",
+    "PlanDays",
+]
+STATS_COLUMNS = ["Activity", "TotalHours", "AverageHoursPerDay", "AverageCompletionPercent"]
+META_COLUMNS = ["ExportedAt", "RowCount"]
+WRITER_OPTIONS = {
+    "constant_memory": True,
+    "strings_to_urls": False,
+    "strings_to_formulas": False,
+}
+
+_EXECUTOR: Optional[ProcessPoolExecutor] = None
+
+
+def _executor() -> ProcessPoolExecutor:
+    """Single worker process shared by background exports (created on first use).
+
+    The worker is spawned, not forked: a fork of the threaded wx process could
+    inherit held locks and the GUI's display connection.
+    """
+
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        _EXECUTOR = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    return _EXECUTOR
+
+
+def _export_in_worker(export_path: Path, entries: List[Tuple], stats: List[Tuple]) -> Path:
+    return ExcelExporter(export_path).export(entries, stats)
+
+
+def _to_date(value) -> date:
+    """Coerce storage strings and Excel timestamps to plain dates."""
+
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.fromisoformat(str(value)).date()
+
+
+def _write_sheet(book, name: str, columns: List[str], rows: Iterable[Sequence], formats: Dict[type, object]) -> None:
+    """Write a header plus rows strictly in row order."""
+
+    sheet = book.add_worksheet(name)
+    sheet.write_row(0, 0, columns)
+    for row_idx, row in enumerate(rows, start=1):
+        for col_idx, value in enumerate(row):
+            if isinstance(value, date):
+                sheet.write_datetime(row_idx, col_idx, value, formats[datetime if isinstance(value, datetime) else date])
+            else:
+                sheet.write(row_idx, col_idx, value)
+
 
 class ExcelExporter:
     def __init__(self, export_path: Path):
         self.export_path = Path(export_path)
         self.export_path.parent.mkdir(parents=True, exist_ok=True)
 
+    def export_async(self, entries: Iterable[Tuple], stats: Iterable) -> "Future[Path]":
+        """Serialize the workbook in a worker process so the UI thread is not blocked."""
+        return _executor().submit(_export_in_worker, self.export_path, list(entries), list(stats))
+
     def export(self, entries: Iterable[Tuple], stats: Iterable) -> Path:
         """Export entries and stats to Excel, deduplicating by date + activity."""
-        normalized = []
+        stats = list(stats)
+        # Keyed by (Date, Activity) so repeated pairs collapse here, last one winning.
+        normalized_by_key: Dict[Tuple[date, str], Tuple] = {}
+        # Activity names and stop reasons repeat on most rows; keep one shared
+        # object per distinct value (the row-tuple analogue of a categorical).
+        shared: Dict[str, str] = {}
         for entry in entries:
             (
                 entry_date,
@@ -33,58 +114,129 @@ class ExcelExporter:
             ) = entry
             plan_total = rest[0] if len(rest) > 0 else 0.0
             plan_days = rest[1] if len(rest) > 1 else 1
-            normalized.append(
-                (
-                    entry_date,
-                    activity,
-                    duration,
-                    objectives,
-                    target,
-                    completion,
-                    stop_reason,
-                    comments,
-                    plan_total,
-                    plan_days,
-                )
+            entry_date = _to_date(entry_date)
+            activity = shared.setdefault(activity, activity)
+            normalized_by_key[(entry_date, activity)] = (
+                entry_date,
+                activity,
+                duration,
+                objectives,
+                target,
+                completion,
+                shared.setdefault(stop_reason, stop_reason),
+                comments,
+                plan_total,
+                plan_days,
             )
+        normalized = list(normalized_by_key.values())
 
-        raw_df = pd.DataFrame(
-            normalized,
-            columns=[
-                "Date",
-                "Activity",
-                "DurationHours",
-                "ObjectivesSucceeded",
-                "TargetHours",
-                "CompletionPercent",
-                "StopReason",
-                "Comments",
-                "PlanTotalHours",
-                "PlanDays",
-            ],
-        )
-        raw_df["Date"] = pd.to_datetime(raw_df["Date"]).dt.date
-
-        existing_raw = None
-        if self.export_path.exists():
+        rows = self._read_cache()
+        if rows is not None:
+            # The sidecar mirrors RawData, so merge against it and stream a fresh
+            # workbook rather than parsing the existing XML.
+            merged = {(row[0], row[1]): row for row in rows}
+            for row in normalized:
+                merged[(row[0], row[1])] = row
+            rows = list(merged.values())
+            self._write_workbook(rows, stats)
+            LOGGER.info("Exported Excel statistics to %s", self.export_path)
+        elif self.export_path.exists():
             try:
-                existing_raw = pd.read_excel(self.export_path, sheet_name="RawData")
+                rows = self._update_workbook(normalized, stats)
             except Exception:
                 LOGGER.warning("Existing Excel file unreadable, recreating: %s", self.export_path)
+            else:
+                LOGGER.info("Updated Excel statistics in %s", self.export_path)
 
-        if existing_raw is not None:
-            combined = pd.concat([existing_raw, raw_df], ignore_index=True)
-            combined.drop_duplicates(subset=["Date", "Activity"], keep="last", inplace=True)
-            raw_df = combined
+        if rows is None:
+            rows = normalized
+            self._write_workbook(rows, stats)
+            LOGGER.info("Exported Excel statistics to %s", self.export_path)
+        self._write_cache(rows)
+        return self.export_path
 
-        stats_df = pd.DataFrame(stats, columns=["Activity", "TotalHours", "AverageHoursPerDay", "AverageCompletionPercent"])
+    @property
+    def cache_path(self) -> Path:
+        return self.export_path.with_suffix(".rawdata.parquet")
 
-        with pd.ExcelWriter(self.export_path, engine="openpyxl", mode="w") as writer:
-            raw_df.to_excel(writer, sheet_name="RawData", index=False)
-            stats_df.to_excel(writer, sheet_name="Stats", index=False)
-            meta_df = pd.DataFrame(
-                [[datetime.now(), len(raw_df)]], columns=["ExportedAt", "RowCount"]
-            )
-            meta_df.to_excel(writer, sheet_name="Meta", index=False)
-        LOGGER.info("Exported Excel statistics to %s", self.export_path)
-        return self.export_path
+    def _read_cache(self) -> Optional[List[Tuple]]:
+        """Return RawData rows from the parquet sidecar when it is at least as new as the workbook."""
+
+        if pq is None or not self.export_path.exists() or not self.cache_path.exists():
+            return None
+        if self.cache_path.stat().st_mtime < self.export_path.stat().st_mtime:
+            return None
+        try:
+            columns = pq.read_table(self.cache_path).to_pydict()
+        except Exception:
+            LOGGER.warning("RawData cache unreadable, falling back to workbook: %s", self.cache_path)
+            return None
+        return list(zip(*(columns[name] for name in RAW_COLUMNS)))
+
+    def _write_cache(self, rows: List[Tuple]) -> None:
+        if pa is None:
+            return
+        try:
+            table = pa.table({name: [row[idx] for row in rows] for idx, name in enumerate(RAW_COLUMNS)})
+            pq.write_table(table, self.cache_path, compression="zstd")
+        except Exception:
+            LOGGER.warning("Unable to write RawData cache %s", self.cache_path, exc_info=True)
+            self.cache_path.unlink(missing_ok=True)
+
+    def _update_workbook(self, rows: List[Tuple], stats: Iterable) -> List[Tuple]:
+        """Patch RawData in place, touching only rows whose (Date, Activity) is new or changed.
+
+        Returns every RawData row after the update.
+        """
+
+        book = load_workbook(self.export_path)
+        sheet = book["RawData"]
+        index = {}
+        for row_idx, (row_date, activity) in enumerate(
+            sheet.iter_rows(min_row=2, max_col=2, values_only=True), start=2
+        ):
+            if row_date is not None:
+                index[(_to_date(row_date), activity)] = row_idx
+        for row in rows:
+            key = (row[0], row[1])
+            row_idx = index.get(key)
+            if row_idx is None:
+                sheet.append(row)
+                index[key] = sheet.max_row
+            else:
+                for col_idx, value in enumerate(row, start=1):
+                    sheet.cell(row=row_idx, column=col_idx, value=value)
+
+        # Stats and Meta are small, so they are simply rebuilt.
+        for name, columns, sheet_rows in (
+            ("Stats", STATS_COLUMNS, stats),
+            ("Meta", META_COLUMNS, [(datetime.now(), len(index))]),
+        ):
+            if name in book.sheetnames:
+                del book[name]
+            small_sheet = book.create_sheet(name)
+            small_sheet.append(columns)
+            for sheet_row in sheet_rows:
+                small_sheet.append(tuple(sheet_row))
+        book.save(self.export_path)
+        return [
+            (_to_date(row[0]), *row[1:])
+            for row in sheet.iter_rows(min_row=2, max_col=len(RAW_COLUMNS), values_only=True)
+            if row[0] is not None
+        ]
+
+    def _write_workbook(self, rows: List[Tuple], stats: Iterable) -> None:
+        # xlsxwriter streams rows to disk in constant_memory mode. That mode drops
+        # cells written out of row order, so every sheet is written row by row
+        # straight through the workbook API.
+        book = xlsxwriter.Workbook(str(self.export_path), WRITER_OPTIONS)
+        try:
+            formats = {
+                date: book.add_format({"num_format": "yyyy-mm-dd"}),
+                datetime: book.add_format({"num_format": "yyyy-mm-dd hh:mm:ss"}),
+            }
+            _write_sheet(book, "RawData", RAW_COLUMNS, rows, formats)
+            _write_sheet(book, "Stats", STATS_COLUMNS, stats, formats)
+            _write_sheet(book, "Meta", META_COLUMNS, [(datetime.now(), len(rows))], formats)
+        finally:
+            book.close()
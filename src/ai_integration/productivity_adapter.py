@@ -9,7 +9,9 @@ unavailable, the adapter returns neutral outputs so the app continues to work.
 """
 from __future__ import annotations
 
+import functools
 import importlib
+import importlib.machinery
 import importlib.util
 import inspect
 import logging
@@ -17,26 +19,51 @@ import os
 import sys
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Iterable, List, Optional, Sequence, Tuple, Union
+from types import ModuleType
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 from tracker_app.tracker.storage import Storage
 
 LOGGER = logging.getLogger(__name__)
+
+try:  # pandas is optional; without it the adapter returns neutral outputs
+    import pandas as _pd
+except ImportError:  # pragma: no cover - depends on environment
+    _pd = None
+    LOGGER.warning("pandas not installed; productivity adapter will return neutral outputs")
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 DEFAULT_DB = Path.home() / ".study_tracker" / "data.db"
 DEFAULT_REPO = PROJECT_ROOT / "ai_productivity_tracker"
+PYCACHE_DIR = Path.home() / ".study_tracker" / "pycache"
 NEUTRAL_SCORE = 0.0
+# Ranges wider than this are read straight into pandas from SQLite.
+SQL_FRAME_THRESHOLD = timedelta(days=30)
+ENTRIES_QUERY = """
+    SELECT de.date AS date,
+           a.name AS task,
+           COALESCE(de.duration_hours, 0.0) AS duration_hours,
+           COALESCE(de.target_hours, 0.0) AS target_hours,
+           de.plan_total_hours AS plan_total_hours,
+           de.plan_days AS plan_days,
+           COALESCE(de.completion_percent, 0.0) AS completion_percent,
+           COALESCE(de.objectives_succeeded, '') AS objectives,
+           COALESCE(de.stop_reason, '') AS stop_reason,
+           COALESCE(de.comments, '') AS comments
+    FROM daily_entries de
+    JOIN activities a ON a.id = de.activity_id
+    WHERE de.date BETWEEN ? AND ?
+    ORDER BY de.date ASC
+"""
+SKIPPED_DIRS = frozenset({".git", "venv", ".venv", "__pycache__", "tests"})
 
 DateInput = Union[date, datetime, str]
 RangeInput = Union[DateInput, Sequence[DateInput]]
 
 
 def _get_pandas():
-    spec = importlib.util.find_spec("pandas")
-    if spec is None:
-        LOGGER.warning("pandas not installed; productivity adapter will return neutral outputs")
-        return None
-    return importlib.import_module("pandas")
+    return _pd
 
 
 class _ExternalProductivity:
@@ -50,6 +77,9 @@ class _ExternalProductivity:
         self.train_fn = None
         self.predict_fn = None
         self.insights_fn = None
+        self._modules: Dict[Path, Optional[ModuleType]] = {}
+        self._sources: Dict[Path, str] = {}
+        self._py_files: List[Path] = []
 
     def load(self) -> None:
         if self._loaded:
@@ -60,6 +90,15 @@ class _ExternalProductivity:
             return
         if str(self.repo_path) not in sys.path:
             sys.path.insert(0, str(self.repo_path))
+        if sys.pycache_prefix is None and not os.access(self.repo_path, os.W_OK):
+            # Read-only checkout: keep its bytecode in a per-user cache instead.
+            PYCACHE_DIR.mkdir(parents=True, exist_ok=True)
+            sys.pycache_prefix = str(PYCACHE_DIR)
+        self._py_files = sorted(
+            pyfile
+            for pyfile in self.repo_path.rglob("*.py")
+            if not SKIPPED_DIRS.intersection(pyfile.relative_to(self.repo_path).parts[:-1])
+        )
         self.train_fn = self._find_func("train_model")
         self.predict_fn = self._find_func("predict_productivity")
         self.insights_fn = self._find_func("get_productivity_insights")
@@ -70,20 +109,68 @@ class _ExternalProductivity:
         """Search python files in the repo for a matching function name."""
 
         assert self.repo_path
-        for pyfile in sorted(self.repo_path.rglob("*.py")):
-            try:
-                spec = importlib.util.spec_from_file_location(pyfile.stem, pyfile)
-                if spec and spec.loader:
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)  # type: ignore[arg-type]
-                    if hasattr(module, name):
-                        LOGGER.info("Found %s in %s", name, pyfile)
-                        return getattr(module, name)
-            except Exception:  # pragma: no cover - defensive guard
-                LOGGER.debug("Skipping %s while probing for %s", pyfile, name, exc_info=True)
+        marker = f"def {name}("
+        for pyfile in self._py_files:
+            # Only execute modules whose source actually defines the function.
+            if marker not in self._source(pyfile):
+                continue
+            module = self._import(pyfile, name)
+            if module is not None and hasattr(module, name):
+                LOGGER.info("Found %s in %s", name, pyfile)
+                return getattr(module, name)
         LOGGER.warning("Function %s not located in AI-Productivity-Tracker", name)
         return None
 
+    def _source(self, pyfile: Path) -> str:
+        if pyfile not in self._sources:
+            try:
+                self._sources[pyfile] = pyfile.read_text(encoding="utf-8", errors="ignore")
+            except OSError:
+                self._sources[pyfile] = ""
+        return self._sources[pyfile]
+
+    def _import(self, pyfile: Path, name: str) -> Optional[ModuleType]:
+        """Execute each repo module at most once across ``_find_func`` lookups."""
+
+        if pyfile in self._modules:
+            return self._modules[pyfile]
+        module = sys.modules.get(pyfile.stem)
+        if module is not None and getattr(module, "__file__", None) == str(pyfile):
+            self._modules[pyfile] = module
+            return module
+        module = None
+        try:
+            # SourceFileLoader reuses/writes __pycache__ bytecode, so later launches skip parsing.
+            loader = importlib.machinery.SourceFileLoader(pyfile.stem, str(pyfile))
+            spec = importlib.util.spec_from_loader(loader.name, loader, origin=str(pyfile))
+            module = importlib.util.module_from_spec(spec)
+            loader.exec_module(module)
+        except Exception:  # pragma: no cover - defensive guard
+            LOGGER.debug("Skipping %s while probing for %s", pyfile, name, exc_info=True)
+            module = None
+        self._modules[pyfile] = module
+        return module
+
+
+@functools.lru_cache(maxsize=8)
+def _load_adapter(repo_path: Path) -> _ExternalProductivity:
+    adapter = _ExternalProductivity(repo_path)
+    adapter.load()
+    return adapter
+
+
+def _get_adapter(repo_path: Optional[Path] = None) -> _ExternalProductivity:
+    """Return a loaded adapter, reusing earlier loads of the same checkout."""
+
+    env_path = os.getenv("AI_PRODUCTIVITY_TRACKER_PATH")
+    path = Path(env_path) if env_path else (repo_path or DEFAULT_REPO)
+    if not path.exists():
+        # Not cached so a checkout cloned while the app runs is picked up.
+        adapter = _ExternalProductivity(path)
+        adapter.load()
+        return adapter
+    return _load_adapter(path)
+
 
 def _get_storage(storage: Optional[Storage] = None) -> Storage:
     return storage or Storage(DEFAULT_DB)
@@ -107,12 +194,18 @@ def _normalize_range(input_value: RangeInput) -> Tuple[date, date]:
     return today - timedelta(days=6), today
 
 
+@functools.lru_cache(maxsize=64)
+def _cached_params(func) -> frozenset:
+    """Parameter names accepted by ``func``; inspect.signature is too slow per call."""
+    return frozenset(inspect.signature(func).parameters)
+
+
 def _safe_call(func, default, **kwargs):
     if func is None:
         return default
     try:
-        sig = inspect.signature(func)
-        allowed = {k: v for k, v in kwargs.items() if k in sig.parameters}
+        params = _cached_params(func)
+        allowed = {k: v for k, v in kwargs.items() if k in params}
         return func(**allowed)  # type: ignore[call-arg]
     except Exception:  # pragma: no cover - external dependency
         LOGGER.exception("External AI Productivity call failed; returning default")
@@ -122,11 +215,32 @@ def _safe_call(func, default, **kwargs):
 def _build_frame(
     storage: Storage, user_id: str, start: date, end: date
 ):
+    """Return the entries as a DataFrame, or None when pandas is missing or the range is empty."""
+
+    if end - start > SQL_FRAME_THRESHOLD:
+        pd = _get_pandas()
+        if pd is None:
+            return None
+        frame = _build_frame_sql(pd, storage, user_id, start, end)
+        return None if frame.empty else frame
+    entries = storage.get_entries_between(start, end)
+    if not entries:
+        # Nothing to score; skip the pandas probe and the external call entirely.
+        return None
     pd = _get_pandas()
     if pd is None:
         return None
-    entries = storage.get_entries_between(start, end)
-    rows: List[dict] = []
+    # Collect column arrays directly so pandas does not re-hash a dict per row.
+    dates: List[date] = []
+    tasks: List[str] = []
+    durations: List[float] = []
+    targets: List[float] = []
+    plan_totals: List[float] = []
+    plan_days_col: List[int] = []
+    completions: List[float] = []
+    objectives_col: List[str] = []
+    stop_reasons: List[str] = []
+    comments_col: List[str] = []
     for entry in entries:
         # Storage may return extra columns (e.g., comments) as the schema evolves.
         (
@@ -142,24 +256,49 @@ def _build_frame(
         comments = rest[0] if rest else ""
         plan_total = rest[1] if len(rest) > 1 else target_hours or 0.0
         plan_days = rest[2] if len(rest) > 2 else 1
-        entry_dt = _normalize_date(entry_date)
-        rows.append(
-            {
-                "user_id": user_id,
-                "date": entry_dt,
-                "task": activity_name,
-                "duration_hours": hours or 0.0,
-                "target_hours": target_hours or 0.0,
-                "plan_total_hours": plan_total,
-                "plan_days": plan_days,
-                "completion_percent": completion_percent or 0.0,
-                "objectives": objectives or "",
-                "stop_reason": stop_reason or "",
-                "comments": comments or "",
-                "category": "General",
-            }
+        dates.append(_normalize_date(entry_date))
+        tasks.append(activity_name)
+        durations.append(hours or 0.0)
+        targets.append(target_hours or 0.0)
+        plan_totals.append(plan_total)
+        plan_days_col.append(plan_days)
+        completions.append(completion_percent or 0.0)
+        objectives_col.append(objectives or "")
+        stop_reasons.append(stop_reason or "")
+        comments_col.append(comments or "")
+    return pd.DataFrame(
+        {
+            "user_id": [user_id] * len(dates),
+            "date": dates,
+            "task": tasks,
+            "duration_hours": pd.array(durations, dtype="float64"),
+            "target_hours": pd.array(targets, dtype="float64"),
+            "plan_total_hours": plan_totals,
+            "plan_days": plan_days_col,
+            "completion_percent": pd.array(completions, dtype="float64"),
+            "objectives": objectives_col,
+            "stop_reason": stop_reasons,
+            "comments": comments_col,
+            # Every row shares one category, so store it as a single categorical code.
+            "category": pd.Categorical.from_codes([0] * len(dates), categories=["General"]),
+        }
+    )
+
+
+def _build_frame_sql(pd, storage: Storage, user_id: str, start: date, end: date):
+    """Let pandas build the columns from the cursor, skipping the Python row loop."""
+
+    with storage.connection() as conn:
+        frame = pd.read_sql_query(
+            ENTRIES_QUERY,
+            conn,
+            params=(start.isoformat(), end.isoformat()),
+            parse_dates=["date"],
         )
-    return pd.DataFrame(rows)
+    frame["date"] = frame["date"].dt.date
+    frame.insert(0, "user_id", user_id)
+    frame["category"] = pd.Categorical.from_codes([0] * len(frame), categories=["General"])
+    return frame
 
 
 def train_productivity_model(
@@ -171,8 +310,7 @@ def train_productivity_model(
     """Train the external productivity model using local study-tracker data."""
 
     store = _get_storage(storage)
-    adapter = _ExternalProductivity(repo_path)
-    adapter.load()
+    adapter = _get_adapter(repo_path)
     if not adapter.train_fn:
         return None
     start, end = date.min, date.max
@@ -196,8 +334,7 @@ def predict_productivity(
     frame = _build_frame(store, user_id, start, end)
     if frame is None:
         return NEUTRAL_SCORE
-    adapter = _ExternalProductivity(repo_path)
-    adapter.load()
+    adapter = _get_adapter(repo_path)
     if not adapter.predict_fn:
         return NEUTRAL_SCORE
     return float(
@@ -205,6 +342,41 @@ def predict_productivity(
     )
 
 
+def predict_productivity_bulk(
+    user_id: str,
+    dates: Sequence[DateInput],
+    *,
+    storage: Optional[Storage] = None,
+    repo_path: Optional[Path] = None,
+) -> np.ndarray:
+    """Return one productivity score per date, reading storage and building the frame once.
+
+    Each date is scored on its own slice of the shared frame, so the result
+    matches calling :func:`predict_productivity` per date; dates without
+    entries get ``NEUTRAL_SCORE``.
+    """
+
+    days = [_normalize_date(value) for value in dates]
+    scores = np.full(len(days), NEUTRAL_SCORE, dtype=float)
+    if not days:
+        return scores
+    store = _get_storage(storage)
+    frame = _build_frame(store, user_id, min(days), max(days))
+    if frame is None:
+        return scores
+    adapter = _get_adapter(repo_path)
+    if not adapter.predict_fn:
+        return scores
+    by_day = {day: group.reset_index(drop=True) for day, group in frame.groupby("date", sort=False)}
+    for i, day in enumerate(days):
+        group = by_day.get(day)
+        if group is not None:
+            scores[i] = float(
+                _safe_call(adapter.predict_fn, NEUTRAL_SCORE, data=group, user_id=user_id, date_range=(day, day), date=day)
+            )
+    return scores
+
+
 def get_productivity_insights(
     user_id: str,
     date_range: RangeInput,
@@ -219,8 +391,7 @@ def get_productivity_insights(
     frame = _build_frame(store, user_id, start, end)
     if frame is None:
         return []
-    adapter = _ExternalProductivity(repo_path)
-    adapter.load()
+    adapter = _get_adapter(repo_path)
     default: List[str] = []
     result = _safe_call(
         adapter.insights_fn,
@@ -0,0 +1,28 @@
+import hashlib
+import json
+
+from tracker_app.core.auth import FirebaseAuthManager
+
+
+def test_local_sign_up_and_sign_in(tmp_path, monkeypatch):
+    monkeypatch.delenv("FIREBASE_CREDENTIALS", raising=False)
+    auth = FirebaseAuthManager(tmp_path)
+    assert auth.sign_up("me@example.com", "secret") == "me@example.com"
+
+    assert auth.sign_in("me@example.com", "secret") == "me@example.com"
+    assert auth.sign_in("me@example.com", "wrong") is None
+    assert auth.sign_in("other@example.com", "secret") is None
+
+    # A fresh manager has no session cache and must read users.json.
+    fresh = FirebaseAuthManager(tmp_path)
+    assert fresh.sign_in("me@example.com", "secret") == "me@example.com"
+
+
+def test_local_sign_in_accepts_legacy_hex_digest(tmp_path, monkeypatch):
+    monkeypatch.delenv("FIREBASE_CREDENTIALS", raising=False)
+    legacy = hashlib.sha256(b"secret").hexdigest()
+    (tmp_path / "users.json").write_text(json.dumps({"me@example.com": legacy}), encoding="utf-8")
+
+    auth = FirebaseAuthManager(tmp_path)
+    assert auth.sign_in("me@example.com", "secret") == "me@example.com"
+    assert auth.sign_in("me@example.com", "wrong") is None
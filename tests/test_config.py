@@ -1,3 +1,7 @@
+import os
+import tomllib
+
+from tracker_app.tracker import controllers
 from tracker_app.tracker.controllers import AppConfig
 
 
@@ -67,5 +71,36 @@ def test_to_toml_with_last_activity():
     assert parsed.last_layout == "abc"
     assert parsed.show_help_tips is False
     assert parsed.last_workspace == "Workspace X"
-from tracker_app.tracker.controllers import AppConfig
 
+
+def test_config_manager_skips_unchanged_writes(tmp_path, monkeypatch):
+    config_file = tmp_path / "config.toml"
+    monkeypatch.setattr(controllers, "CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(controllers, "CONFIG_FILE", config_file)
+
+    manager = controllers.ConfigManager()
+    assert config_file.exists()
+    os.utime(config_file, ns=(1, 1))
+
+    manager.save()
+    assert config_file.stat().st_mtime_ns == 1
+
+    manager.config.last_layout = "changed"
+    manager.save()
+    assert config_file.stat().st_mtime_ns != 1
+    assert controllers.ConfigManager().config.last_layout == "changed"
+
+
+def test_to_toml_escapes_strings():
+    cfg = AppConfig(
+        export_path="C:\\Users\\me\\stats.xlsx",
+        default_range_days=7,
+        last_window_width=1000,
+        last_window_height=700,
+        last_layout='say "hi"\nthere',
+    )
+
+    parsed = tomllib.loads(cfg.to_toml())
+    assert parsed["export_path"] == "C:\\Users\\me\\stats.xlsx"
+    assert parsed["last_layout"] == 'say "hi"\nthere'
+    assert 'last_workspace = "Workspace 1"' in cfg.to_toml()
@@ -0,0 +1,31 @@
+import numpy as np
+
+from tracker_app.ml.data_pipeline import TaskRecord, build_task_matrix
+
+
+def test_build_task_matrix_encodes_features():
+    records = [
+        TaskRecord("a" * 50, "b" * 100, "Work", "High", 2.0, 0.0, 0),
+        TaskRecord("", "", "Study", "Unknown", 1.0, 0.0, 0),
+        TaskRecord("x", "", "Work", "Low", 0.5, 0.0, 0),
+    ]
+    matrix = build_task_matrix(records, category_map={})
+
+    assert matrix.dtype == np.float32
+    assert matrix.shape == (3, 5)
+    np.testing.assert_allclose(matrix[0], [0.5, 0.5, 0.0, 2.0, 2.0])
+    np.testing.assert_allclose(matrix[1], [0.0, 0.0, 1.0, 1.0, 1.0])
+    np.testing.assert_allclose(matrix[2], [0.01, 0.0, 0.0, 0.0, 0.5])
+
+
+def test_build_task_matrix_empty():
+    assert build_task_matrix([]).shape == (0, 5)
+
+
+def test_build_task_matrix_keeps_category_codes_across_calls():
+    mapping = {}
+    build_task_matrix([TaskRecord("", "", "Work", "Low", 1.0, 0.0, 0)], category_map=mapping)
+    single = build_task_matrix([TaskRecord("", "", "Study", "Low", 1.0, 0.0, 0)], category_map=mapping)
+
+    assert mapping == {"Work": 0.0, "Study": 1.0}
+    assert single[0, 2] == 1.0
@@ -0,0 +1,78 @@
+from datetime import date
+
+from openpyxl import load_workbook
+
+from reports import excel_export
+from reports.excel_export import ExcelExporter
+
+
+FIRST = [
+    ("2024-01-01", "A", 1.0, "o", 2.0, 50.0, "r", "c", 2.0, 1),
+    ("2024-01-02", "B", 1.0, "", 0.0, 0.0, "", ""),
+]
+SECOND = [
+    ("2024-01-01", "A", 3.0, "o2", 2.0, 90.0, "r", "c", 2.0, 1),
+    ("2024-01-03", "A", 1.0, "", 0.0, 0.0, "", "", 0.0, 1),
+]
+
+
+def _raw_rows(path):
+    sheet = load_workbook(path)["RawData"]
+    return [
+        (row[0].date(), row[1], row[2])
+        for row in sheet.iter_rows(min_row=2, max_col=3, values_only=True)
+    ]
+
+
+def test_export_replaces_rows_with_same_date_and_activity(tmp_path):
+    exporter = ExcelExporter(tmp_path / "stats.xlsx")
+    exporter.export(FIRST, [("A", 1.0, 1.0, 50.0)])
+    exporter.export(SECOND, [("A", 4.0, 2.0, 70.0)])
+
+    assert sorted(_raw_rows(exporter.export_path)) == [
+        (date(2024, 1, 1), "A", 3.0),
+        (date(2024, 1, 2), "B", 1.0),
+        (date(2024, 1, 3), "A", 1.0),
+    ]
+
+
+def test_export_updates_workbook_without_cache(tmp_path):
+    exporter = ExcelExporter(tmp_path / "stats.xlsx")
+    exporter.export(FIRST, [("A", 1.0, 1.0, 50.0)])
+    exporter.cache_path.unlink(missing_ok=True)
+    exporter.export(SECOND, [("A", 4.0, 2.0, 70.0)])
+
+    assert sorted(_raw_rows(exporter.export_path)) == [
+        (date(2024, 1, 1), "A", 3.0),
+        (date(2024, 1, 2), "B", 1.0),
+        (date(2024, 1, 3), "A", 1.0),
+    ]
+    meta = load_workbook(exporter.export_path)["Meta"]
+    assert meta.cell(row=2, column=2).value == 3
+
+
+def test_export_recreates_unreadable_workbook(tmp_path):
+    exporter = ExcelExporter(tmp_path / "stats.xlsx")
+    exporter.export_path.write_text("not a workbook", encoding="utf-8")
+    exporter.export(SECOND, [])
+
+    assert len(_raw_rows(exporter.export_path)) == 2
+
+
+def test_export_collapses_duplicate_input_rows(tmp_path):
+    exporter = ExcelExporter(tmp_path / "stats.xlsx")
+    exporter.export(FIRST + SECOND, [])
+
+    assert sorted(_raw_rows(exporter.export_path)) == [
+        (date(2024, 1, 1), "A", 3.0),
+        (date(2024, 1, 2), "B", 1.0),
+        (date(2024, 1, 3), "A", 1.0),
+    ]
+
+
+def test_export_async_runs_in_spawned_worker(tmp_path):
+    exporter = ExcelExporter(tmp_path / "stats.xlsx")
+
+    assert exporter.export_async(SECOND, []).result(timeout=120) == exporter.export_path
+    assert excel_export._executor()._mp_context.get_start_method() == "spawn"
+    assert len(_raw_rows(exporter.export_path)) == 2
@@ -0,0 +1,109 @@
+from types import SimpleNamespace
+
+from tracker_app.ml import gemini_client
+
+
+class _FakeModel:
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+
+    def generate_content(self, prompt, stream=False):
+        self.calls += 1
+        # Split the reply into small chunks the way a streamed response arrives.
+        return [SimpleNamespace(text=self.text[i:i + 3]) for i in range(0, len(self.text), 3)]
+
+
+def test_cached_generate_reuses_stored_response(tmp_path, monkeypatch):
+    monkeypatch.setattr(gemini_client, "CACHE_PATH", tmp_path / "cache.db")
+    model = _FakeModel("2.5")
+
+    assert gemini_client._cached_generate(model, "prompt", 60) == "2.5"
+    assert gemini_client._cached_generate(model, "prompt", 60) == "2.5"
+    assert model.calls == 1
+
+    gemini_client._cached_generate(model, "other prompt", 60)
+    gemini_client._cached_generate(model, "prompt", 0)
+    assert model.calls == 3
+
+
+def test_cached_generate_skips_empty_responses(tmp_path, monkeypatch):
+    monkeypatch.setattr(gemini_client, "CACHE_PATH", tmp_path / "cache.db")
+    model = _FakeModel("")
+
+    gemini_client._cached_generate(model, "prompt", 60)
+    gemini_client._cached_generate(model, "prompt", 60)
+    assert model.calls == 2
+
+
+def test_bulk_priority_parses_numbered_reply(tmp_path, monkeypatch):
+    monkeypatch.setattr(gemini_client, "CACHE_PATH", tmp_path / "cache.db")
+    model = _FakeModel("1: High\n2) low priority\n7: Critical")
+    monkeypatch.setattr(gemini_client, "_client", lambda: model)
+
+    tasks = [{"title": "a"}, {"title": "b"}, {"title": "c"}]
+    assert gemini_client.suggest_priority_bulk(tasks) == ["High", "Low", None]
+    assert model.calls == 1
+
+
+def test_generate_retries_flex_at_standard_tier(monkeypatch):
+    monkeypatch.setattr(gemini_client, "_TIERS_UNSUPPORTED", False)
+    seen = []
+
+    class _Model:
+        def generate_content(self, prompt, stream=False, request_options=None):
+            seen.append(request_options)
+            if request_options:
+                raise RuntimeError("429 resource exhausted")
+            return [SimpleNamespace(text="ok")]
+
+    assert gemini_client._generate(_Model(), "prompt", tier="flex") == "ok"
+    assert seen == [{"service_tier": "flex"}, None]
+
+
+def test_generate_discards_partial_flex_stream(monkeypatch):
+    monkeypatch.setattr(gemini_client, "_TIERS_UNSUPPORTED", False)
+
+    class _Model:
+        def generate_content(self, prompt, stream=False, request_options=None):
+            if request_options:
+                return self._preempted()
+            return [SimpleNamespace(text="first\nsecond")]
+
+        def _preempted(self):
+            yield SimpleNamespace(text="first\n")
+            raise RuntimeError("503 preempted")
+
+    assert gemini_client._generate(_Model(), "prompt", tier="flex") == "first\nsecond"
+
+
+def test_cached_generate_joins_streamed_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(gemini_client, "CACHE_PATH", tmp_path / "cache.db")
+    model = _FakeModel("- first insight\n- second insight")
+
+    assert gemini_client._cached_generate(model, "prompt", 60) == "- first insight\n- second insight"
+    assert gemini_client._cached_generate(model, "prompt", 60) == "- first insight\n- second insight"
+    assert model.calls == 1
+
+
+def test_parse_duration_takes_first_number():
+    assert gemini_client._parse_duration("About 2,5 hours (maybe 3)") == 2.5
+    assert gemini_client._parse_duration("1.5") == 1.5
+    assert gemini_client._parse_duration("no idea") is None
+
+
+def test_history_payload_is_compact_and_bounded(monkeypatch):
+    monkeypatch.setattr(gemini_client, "HISTORY_PROMPT_LIMIT", 2)
+    history = [{"title": "A", "actual_duration": 1.0, "estimated_duration": 2.0}] * 3
+    history.append({"title": "B", "actual_duration": 0.5, "estimated_duration": 0.5})
+
+    payload = gemini_client._history_payload(history)
+
+    assert payload.startswith('Earlier totals by task: [{"title":"A","entries":2,"actual_hours":2.0,')
+    assert payload.endswith('Recent entries: [{"title":"A","actual_duration":1.0,"estimated_duration":2.0},'
+                            '{"title":"B","actual_duration":0.5,"estimated_duration":0.5}]')
+
+
+def test_parse_priority_matches_whole_words():
+    assert gemini_client._parse_priority("Priority: HIGH") == "High"
+    assert gemini_client._parse_priority("Highlight the slow parts") is None
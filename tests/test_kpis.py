@@ -1,5 +1,6 @@
-from datetime import date
+from datetime import date, timedelta
 
+from tracker_app.tracker import controllers
 from tracker_app.tracker.controllers import AppConfig, AppController
 from tracker_app.tracker.storage import Storage
 from tracker_app.tracker.timers import TimerManager
@@ -39,3 +40,128 @@ def test_get_kpis(tmp_path):
     assert kpis["completion_rate"] == "100%"
     assert "efficiency_index" in kpis
     assert "task_velocity" in kpis
+
+
+def test_get_kpis_overtime_per_day(tmp_path):
+    storage = Storage(tmp_path / "kpis.db")
+    first = storage.create_activity("Deep Work", description="", default_target_hours=0.0)
+    second = storage.create_activity("Email", description="", default_target_hours=0.0)
+    today = date.today()
+    yesterday = date.fromordinal(today.toordinal() - 1)
+    storage.upsert_daily_entry(yesterday, first.id, duration_hours_delta=6.0, objectives_text="")
+    storage.upsert_daily_entry(yesterday, second.id, duration_hours_delta=3.0, objectives_text="")
+    storage.upsert_daily_entry(today, first.id, duration_hours_delta=5.0, objectives_text="")
+
+    controller = AppController(storage, TimerManager(), DummyExporter(), DummyConfigManager())
+    kpis = controller.get_kpis(yesterday, today)
+
+    assert kpis["overtime"] == "1.0h"
+    assert kpis["switches"] == "1"
+
+
+def test_get_kpis_uses_share_of_multi_day_plan(tmp_path):
+    storage = Storage(tmp_path / "kpis.db")
+    act = storage.create_activity("Thesis", description="", default_target_hours=0.0)
+    today = date.today()
+    storage.upsert_daily_entry(today, act.id, duration_hours_delta=3.0, objectives_text="", plan_total_hours=8.0, plan_days=4)
+
+    controller = AppController(storage, TimerManager(), DummyExporter(), DummyConfigManager())
+    kpis = controller.get_kpis(today, today)
+
+    assert kpis["planned_vs_actual"] == "150%"
+    assert kpis["category_accuracy"] == "Thesis: 150%"
+    assert kpis["procrastination_flags"] == "1"
+
+
+def test_get_kpis_consistency_from_daily_variance(tmp_path):
+    storage = Storage(tmp_path / "kpis.db")
+    act = storage.create_activity("Reading", description="", default_target_hours=0.0)
+    today = date.today()
+    yesterday = date.fromordinal(today.toordinal() - 1)
+    storage.upsert_daily_entry(yesterday, act.id, duration_hours_delta=2.0, objectives_text="")
+    storage.upsert_daily_entry(today, act.id, duration_hours_delta=4.0, objectives_text="")
+
+    controller = AppController(storage, TimerManager(), DummyExporter(), DummyConfigManager())
+
+    assert controller.get_kpis(yesterday, today)["consistency_score"] == "95%"
+    assert controller.get_kpis(today, today)["consistency_score"] == "100%"
+
+
+def test_get_kpis_lists_top_categories(tmp_path):
+    storage = Storage(tmp_path / "kpis.db")
+    today = date.today()
+    for hours in range(1, controllers.KPI_TOP_CATEGORIES + 3):
+        act = storage.create_activity(f"Task {hours}", description="", default_target_hours=0.0)
+        storage.upsert_daily_entry(today, act.id, duration_hours_delta=float(hours), objectives_text="")
+
+    controller = AppController(storage, TimerManager(), DummyExporter(), DummyConfigManager())
+    labels = controller.get_kpis(today, today)["category_hours"].split(", ")
+
+    assert len(labels) == controllers.KPI_TOP_CATEGORIES
+    assert labels[0] == f"Task {controllers.KPI_TOP_CATEGORIES + 2}: {controllers.KPI_TOP_CATEGORIES + 2:.1f}h"
+
+
+def test_today_rechecks_clock_after_interval(tmp_path):
+    controller = AppController(Storage(tmp_path / "today.db"), TimerManager(), DummyExporter(), DummyConfigManager())
+    stale = date(2020, 1, 1)
+    controller._today = stale
+    assert controller.today == stale
+
+    controller._today_checked -= controllers.TODAY_RECHECK_SECONDS
+    assert controller.today == date.today()
+
+
+def test_range_queries_cached_until_storage_changes(tmp_path):
+    storage = Storage(tmp_path / "cache.db")
+    act = storage.create_activity("Deep Work", description="", default_target_hours=0.0)
+    today = date.today()
+    storage.upsert_daily_entry(today, act.id, duration_hours_delta=1.0, objectives_text="")
+    controller = AppController(storage, TimerManager(), DummyExporter(), DummyConfigManager())
+    calls = []
+    aggregates = storage.get_kpi_aggregates
+    storage.get_kpi_aggregates = lambda *args: calls.append(args) or aggregates(*args)
+
+    first = controller.get_kpis(today, today)
+    first["category_hours"] = "mutated by a caller"
+    assert controller.get_kpis(today, today)["category_hours"] == "Deep Work: 1.0h"
+    assert len(calls) == 1
+
+    storage.upsert_daily_entry(today, act.id, duration_hours_delta=1.0, objectives_text="")
+    assert controller.get_kpis(today, today)["category_hours"] == "Deep Work: 2.0h"
+
+
+def test_queue_changes_coalesce_into_one_config_save(tmp_path, monkeypatch):
+    monkeypatch.setattr(controllers, "CONFIG_SAVE_DELAY", 60.0)
+    storage = Storage(tmp_path / "queue.db")
+    act = storage.create_activity("Deep Work", description="", default_target_hours=0.0)
+    config_manager = DummyConfigManager()
+    saves = []
+    config_manager.save = lambda config=None: saves.append(list(config_manager.config.task_queue))
+    controller = AppController(storage, TimerManager(), DummyExporter(), config_manager)
+
+    controller.add_to_queue(act.id)
+    controller.set_auto_start_next(True)
+    assert saves == []
+
+    controller.save_config(act.id)
+    assert saves == [[act.id]]
+    assert controller._config_save_timer is None
+
+
+def test_kpis_ignore_entries_of_deleted_activities(tmp_path):
+    storage = Storage(tmp_path / "orphans.db")
+    act = storage.create_activity("Deep Work", description="", default_target_hours=0.0)
+    today = date.today()
+    yesterday = today - timedelta(days=1)
+    storage.upsert_daily_entry(yesterday, 999, duration_hours_delta=2.0, objectives_text="")
+    controller = AppController(storage, TimerManager(), DummyExporter(), DummyConfigManager())
+
+    assert controller.get_kpis(yesterday, today) == {}
+
+    storage.upsert_daily_entry(today, 999, duration_hours_delta=10.0, objectives_text="")
+    storage.upsert_daily_entry(today, act.id, duration_hours_delta=1.0, objectives_text="")
+    single_day = controller.get_kpis(today, today)
+    two_days = controller.get_kpis(yesterday, today)
+
+    assert single_day["overtime"] == two_days["overtime"] == "0.0h"
+    assert single_day["switches"] == two_days["switches"] == "0"
@@ -58,3 +58,38 @@ def get_productivity_insights(data, user_id=None, date_range=None):
         assert score == 0.85
         assert insights and insights[0].startswith("rows=")
         assert train_result == {"trained_rows": 2}
+
+
+def test_productivity_empty_range_skips_external_call(tmp_path):
+    storage = _seed_storage(tmp_path)
+    repo = tmp_path / "ai_productivity_tracker"
+    repo.mkdir()
+    (repo / "bridge.py").write_text(
+        """
+def predict_productivity(data, user_id=None):
+    return 0.85
+"""
+    )
+    empty_day = date.today() - timedelta(days=10)
+    score = adapter.predict_productivity("user", empty_day, storage=storage, repo_path=repo)
+    assert score == adapter.NEUTRAL_SCORE
+
+
+def test_productivity_bulk_scores_each_date(tmp_path):
+    storage = _seed_storage(tmp_path)
+    repo = tmp_path / "ai_productivity_tracker"
+    repo.mkdir()
+    (repo / "bridge.py").write_text(
+        """
+def predict_productivity(data, date=None):
+    return float(sum(data["duration_hours"]))
+"""
+    )
+    today = date.today()
+    days = [today, today - timedelta(days=1), today - timedelta(days=10)]
+    scores = adapter.predict_productivity_bulk("user", days, storage=storage, repo_path=repo)
+    if not PANDAS_AVAILABLE:
+        assert list(scores) == [adapter.NEUTRAL_SCORE] * 3
+    else:
+        assert list(scores) == [1.5, 1.0, adapter.NEUTRAL_SCORE]
+        assert scores[0] == adapter.predict_productivity("user", today, storage=storage, repo_path=repo)
@@ -1,7 +1,12 @@
+import ast
+import sqlite3
 from datetime import date, timedelta
 from datetime import date, timedelta
 from pathlib import Path
 
+import pytest
+
+from tracker_app.tracker import storage as storage_module
 from tracker_app.tracker.storage import Storage
 
 
@@ -41,3 +46,222 @@ def test_statistics_between(tmp_path):
     assert stats[0].activity_name == "B"
     assert stats[0].total_hours == 3.0
     assert stats[0].avg_completion == 90
+
+
+def test_kpi_aggregates(tmp_path):
+    storage = Storage(tmp_path / "test.db")
+    act1 = storage.create_activity("A").id
+    act2 = storage.create_activity("B").id
+    today = date.today()
+    yesterday = today - timedelta(days=1)
+    storage.upsert_daily_entry(yesterday, act2, duration_hours_delta=2.0, objectives_text="", plan_total_hours=4.0, plan_days=2)
+    storage.upsert_daily_entry(today, act1, duration_hours_delta=3.0, objectives_text="", target_hours=2.0, completion_percent=100, stop_reason="Break")
+    storage.upsert_daily_entry(today, act2, duration_hours_delta=1.0, objectives_text="", completion_percent=50)
+
+    days, activities = storage.get_kpi_aggregates(yesterday, today)
+
+    assert days == [(yesterday.isoformat(), 2.0, 1), (today.isoformat(), 4.0, 2)]
+    assert [row[1] for row in activities] == ["B", "A"]
+    assert activities[1][2:] == (3.0, 3.0, 1, 1, 1, 2.0, 1.5, 1, 1, today.isoformat())
+    assert storage.get_kpi_aggregates(today, today)[0] == [(today.isoformat(), 4.0, 2)]
+
+
+def test_database_uses_wal(tmp_path):
+    storage = Storage(tmp_path / "test.db")
+    with storage.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+
+def test_backup_includes_uncheckpointed_writes(tmp_path):
+    storage = Storage(tmp_path / "test.db")
+    storage.create_activity("A")
+
+    backup = storage.backup_database()
+    storage.close()
+
+    with sqlite3.connect(backup) as conn:
+        assert conn.execute("SELECT name FROM activities").fetchall() == [("A",)]
+    assert [a.name for a in storage.get_activities()] == ["A"]
+
+
+def test_bulk_upsert_matches_single_upserts(tmp_path):
+    storage = Storage(tmp_path / "test.db")
+    act = storage.create_activity("A").id
+    today = date.today()
+    storage.upsert_daily_entries_bulk([
+        (today, act, 1.0, "first", 2.0),
+        (today, act, 0.5, None, None, 60.0, "break"),
+    ])
+
+    entry = storage.get_daily_entry(today, act)
+    assert (entry.duration_hours, entry.objectives_succeeded, entry.target_hours) == (1.5, "first", 2.0)
+    assert (entry.completion_percent, entry.stop_reason, entry.plan_total_hours) == (60.0, "break", 2.0)
+
+
+def test_import_tasks_skips_duplicates(tmp_path):
+    storage = Storage(tmp_path / "test.db")
+    storage.create_activity("A")
+    source = tmp_path / "tasks.csv"
+    source.write_text("name,description,default_target_hours,tags\nA,,1,\nB,new,2.5,x\nB,again,1,\n,,,\n", encoding="utf-8")
+
+    assert storage.import_tasks(source) == 1
+    imported = {a.name: a for a in storage.get_activities()}
+    assert (imported["B"].description, imported["B"].default_target_hours, imported["B"].tags) == ("new", 2.5, "x")
+
+
+class _ExecutemanySpy:
+    """Connection proxy that records what ``executemany`` was handed."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.params = []
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def executemany(self, sql, params):
+        self.params.append(params)
+        return self._conn.executemany(sql, params)
+
+
+def test_import_tasks_streams_rows_into_executemany(tmp_path, monkeypatch):
+    storage = Storage(tmp_path / "test.db")
+    spy = _ExecutemanySpy(storage._thread_conn())
+    monkeypatch.setattr(storage, "_thread_conn", lambda: spy)
+    source = tmp_path / "tasks.csv"
+    source.write_text("name,description,default_target_hours,tags\nA,,1,\nB,,2,\n", encoding="utf-8")
+
+    assert storage.import_tasks(source) == 2
+    assert len(spy.params) == 1
+    assert iter(spy.params[0]) is spy.params[0]
+
+
+def test_legacy_database_gains_missing_columns(tmp_path):
+    db = tmp_path / "legacy.db"
+    with sqlite3.connect(db) as conn:
+        conn.execute("CREATE TABLE activities (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL UNIQUE, is_active INTEGER NOT NULL DEFAULT 1)")
+        conn.execute(
+            "CREATE TABLE daily_entries (id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT NOT NULL, activity_id INTEGER NOT NULL, "
+            "duration_hours REAL NOT NULL DEFAULT 0, objectives_succeeded TEXT, UNIQUE(date, activity_id))"
+        )
+    conn.close()
+    storage = Storage(db)
+    activity = storage.create_activity("Legacy", priority="High")
+    entry = storage.upsert_daily_entry(date(2024, 1, 1), activity.id, 1.0, "", plan_total_hours=4.0, plan_days=2)
+
+    assert activity.priority == "High"
+    assert (entry.plan_total_hours, entry.plan_days) == (4.0, 2)
+
+
+def test_activity_lookups_use_index(tmp_path):
+    storage = Storage(tmp_path / "test.db")
+    with storage.connection() as conn:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT SUM(duration_hours) FROM daily_entries WHERE activity_id = ?", (1,)
+        ).fetchall()
+
+    assert "idx_daily_activity_date" in plan[0][-1]
+
+
+def test_date_ranges_seek_the_unique_index(tmp_path):
+    # ISO dates sort chronologically as text, so ranges stay index seeks.
+    storage = Storage(tmp_path / "test.db")
+    with storage.connection() as conn:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT duration_hours FROM daily_entries WHERE date BETWEEN ? AND ?",
+            ("2024-01-01", "2024-01-31"),
+        ).fetchall()
+
+    assert plan[0][-1].startswith("SEARCH daily_entries USING INDEX")
+
+
+def test_delete_activity_removes_entries_in_one_commit(tmp_path):
+    storage = Storage(tmp_path / "test.db")
+    keep = storage.create_activity("Keep")
+    drop = storage.create_activity("Drop")
+    storage.upsert_daily_entries_bulk(
+        [(date(2024, 1, 1), keep.id, 1.0, ""), (date(2024, 1, 1), drop.id, 2.0, ""), (date(2024, 1, 2), drop.id, 3.0, "")]
+    )
+    version = storage.version
+    storage.delete_activity(drop.id)
+
+    assert storage.version == version + 1
+    assert [a.name for a in storage.get_activities()] == ["Keep"]
+    assert [e.activity_id for e in storage.get_daily_entries_by_date(date(2024, 1, 1))] == [keep.id]
+    assert storage.get_total_hours_for_activity(drop.id) == 0
+
+
+def test_export_tasks_round_trips(tmp_path, monkeypatch):
+    storage = Storage(tmp_path / "test.db")
+    storage.create_activity("Write", description="draft, edit", default_target_hours=1.5, tags="work")
+    storage.create_activity("Read")
+    # Rows must come from the export query itself, not Activity objects.
+    monkeypatch.setattr(storage, "get_activities", lambda: pytest.fail("export_tasks built Activity objects"))
+    target = storage.export_tasks(tmp_path / "tasks.csv")
+
+    assert target.read_text(encoding="utf-8").splitlines() == [
+        "name,description,default_target_hours,tags,is_active",
+        "Read,,0.0,,1",
+        'Write,"draft, edit",1.5,work,1',
+    ]
+    copy = Storage(tmp_path / "copy.db")
+    assert copy.import_tasks(target) == 2
+
+
+def test_time_history_rows(tmp_path):
+    storage = Storage(tmp_path / "test.db")
+    activity = storage.create_activity("A")
+    storage.upsert_daily_entry(date(2024, 1, 1), activity.id, 1.5, "", target_hours=2.0)
+
+    assert storage.get_time_history() == [
+        {"title": "A", "actual_duration": 1.5, "estimated_duration": 2.0, "completion_percent": 0.0}
+    ]
+
+
+def test_connections_return_plain_tuples(tmp_path):
+    storage = Storage(tmp_path / "test.db")
+    with storage.connection() as conn:
+        assert conn.row_factory is None
+        assert conn.text_factory is str
+        assert type(conn.execute("SELECT 'x', 1").fetchone()) is tuple
+
+
+def _defined_names(body):
+    return [node.name for node in body if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef))]
+
+
+def test_storage_module_defines_each_name_once():
+    tree = ast.parse(Path(storage_module.__file__).read_text(encoding="utf-8"))
+    names = _defined_names(tree.body)
+
+    assert len(names) == len(set(names))
+    assert names.count("Storage") == 1
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            methods = _defined_names(node.body)
+            duplicates = sorted({name for name in methods if methods.count(name) > 1})
+            assert not duplicates, f"{node.name} redefines {duplicates}"
+
+
+def test_report_bundle_matches_separate_queries(tmp_path):
+    storage = Storage(tmp_path / "test.db")
+    a = storage.create_activity("A")
+    b = storage.create_activity("B")
+    storage.upsert_daily_entries_bulk([(date(2024, 1, 1), a.id, 1.0, ""), (date(2024, 1, 2), b.id, 3.0, "")])
+    start, end = date(2024, 1, 1), date(2024, 1, 31)
+
+    entries, stats = storage.report_bundle(start, end)
+    storage.close()
+
+    assert entries == storage.get_entries_between(start, end)
+    assert stats == storage.get_statistics_by_activity(start, end)
+
+
+def test_dates_cross_the_driver_as_iso_text(tmp_path):
+    storage = Storage(tmp_path / "test.db")
+    activity = storage.create_activity("A")
+    storage.upsert_daily_entry(date(2024, 1, 5), activity.id, 1.0, "")
+
+    assert storage.get_entries_between(date(2024, 1, 1), date(2024, 1, 31))[0][0] == "2024-01-05"
+    assert storage.get_daily_entries_by_date(date(2024, 1, 5))[0].date == date(2024, 1, 5)
@@ -1,18 +1,19 @@
-"""AI assistant orchestration between core data and TensorFlow APIs."""
+"""AI assistant orchestration between core data and the ML APIs."""
 from __future__ import annotations
 
 import logging
 from datetime import date
-from typing import Dict, Iterable, List, Optional
+from functools import cached_property
+from types import ModuleType
+from typing import Dict, List, Optional, Tuple
 
-from tracker_app.ml import api as ml_api
 from tracker_app.tracker.controllers import AppController
 
 LOGGER = logging.getLogger(__name__)
 
 
 class AIAssistantService:
-    """Provide AI-powered suggestions backed by TensorFlow models.
+    """Provide AI-powered suggestions backed by Gemini and local models.
 
     This layer keeps UI code free of ML details and ensures graceful
     degradation when models are unavailable.
@@ -20,17 +21,25 @@ class AIAssistantService:
 
     def __init__(self, controller: AppController):
         self.controller = controller
+        self._tasks_cache: Optional[Tuple[int, List[Dict[str, str]]]] = None
+
+    @cached_property
+    def ml_api(self) -> ModuleType:
+        """Import the ML layer on first AI request rather than at window construction."""
+        from tracker_app.ml import api as ml_api
+
+        return ml_api
 
     def suggest_duration(self, title: str, description: str, category: str, priority: str) -> Optional[float]:
         try:
-            return ml_api.predict_duration(title, description, category, priority)
+            return self.ml_api.predict_duration(title, description, category, priority)
         except Exception:  # noqa: BLE001
             LOGGER.exception("Duration suggestion failed")
             return None
 
     def suggest_priority(self, title: str, due: Optional[date], category: str) -> Optional[str]:
         try:
-            return ml_api.suggest_priority({"title": title, "due_date": due, "category": category})
+            return self.ml_api.suggest_priority({"title": title, "due_date": due, "category": category})
         except Exception:  # noqa: BLE001
             LOGGER.exception("Priority suggestion failed")
             return None
@@ -39,7 +48,7 @@ class AIAssistantService:
         tasks = self._collect_tasks()
         history = self.controller.storage.get_time_history()
         try:
-            return ml_api.generate_daily_plan(target_date, tasks, history)
+            return self.ml_api.generate_daily_plan(target_date, tasks, history)
         except Exception:  # noqa: BLE001
             LOGGER.exception("Daily plan suggestion failed")
             return []
@@ -47,14 +56,19 @@ class AIAssistantService:
     def analyze_patterns(self) -> List[str]:
         history = self.controller.storage.get_time_history()
         try:
-            return ml_api.analyze_patterns(history)
+            return self.ml_api.analyze_patterns(history)
         except Exception:  # noqa: BLE001
             LOGGER.exception("Pattern analysis failed")
             return ["Insights unavailable. Train the model to unlock analysis."]
 
-    def _collect_tasks(self) -> Iterable[Dict[str, str]]:
-        for activity in self.controller.list_activities():
-            yield {
+    def _collect_tasks(self) -> List[Dict[str, str]]:
+        """Return the task list, re-querying storage only after activities change."""
+
+        rev = self.controller._activities_rev
+        if self._tasks_cache is not None and self._tasks_cache[0] == rev:
+            return self._tasks_cache[1]
+        tasks = [
+            {
                 "id": str(activity.id),
                 "title": activity.name,
                 "category": "General",
@@ -62,4 +76,8 @@ class AIAssistantService:
                 "estimated_duration": 1.0,
                 "due_date": None,
             }
+            for activity in self.controller.list_activities()
+        ]
+        self._tasks_cache = (rev, tasks)
+        return tasks
 
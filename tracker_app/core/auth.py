@@ -7,15 +7,24 @@ the login workflow remains functional offline.
 """
 from __future__ import annotations
 
+import base64
+import binascii
+import hashlib
+import hmac
 import json
 import logging
 import os
-from hashlib import sha256
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 LOGGER = logging.getLogger(__name__)
 
+try:  # pragma: no cover - optional dependency
+    import orjson
+except Exception:  # noqa: BLE001
+    orjson = None  # type: ignore
+
 try:  # pragma: no cover - optional dependency
     import firebase_admin
     from firebase_admin import credentials, firestore
@@ -24,6 +33,13 @@ except Exception:  # noqa: BLE001
     credentials = None  # type: ignore
     firestore = None  # type: ignore
 
+# Copying a pre-built hash object skips the per-call constructor lookup;
+# hashlib already dispatches to OpenSSL's SHA-NI code where the CPU has it.
+_SHA256_TEMPLATE = hashlib.sha256()
+
+# How long a Firestore password-hash lookup is reused before asking again.
+REMOTE_CACHE_TTL = 300.0
+
 
 class FirebaseAuthManager:
     """Handle signup/login using Firebase when configured."""
@@ -32,6 +48,11 @@ class FirebaseAuthManager:
         self.storage_dir = storage_dir
         self.local_users = storage_dir / "users.json"
         self._firestore = self._init_firestore()
+        # Hashes confirmed by sign-up or a successful sign-in during this session.
+        self._user_cache: Dict[str, bytes] = {}
+        self._remote_cache: Dict[str, Tuple[Optional[bytes], float]] = {}
+        self._local_data: dict = {}
+        self._local_mtime: Optional[int] = None
 
     def _init_firestore(self):
         creds_path = os.getenv("FIREBASE_CREDENTIALS")
@@ -45,35 +66,92 @@ class FirebaseAuthManager:
             LOGGER.exception("Failed to initialize Firebase; falling back to local auth")
             return None
 
-    def _hash(self, password: str) -> str:
-        return sha256(password.encode("utf-8")).hexdigest()
+    def _hash(self, password: str) -> bytes:
+        digest = _SHA256_TEMPLATE.copy()
+        digest.update(password.encode("utf-8"))
+        return digest.digest()
+
+    @staticmethod
+    def _encode(digest: bytes) -> str:
+        return base64.b64encode(digest).decode("ascii")
+
+    @staticmethod
+    def _decode(stored: Optional[str]) -> Optional[bytes]:
+        """Turn a stored digest back into raw bytes (None when missing or malformed).
+
+        Digests are stored as base64; 64-character hex values written by older
+        versions are still accepted.
+        """
+
+        if not stored:
+            return None
+        try:
+            if len(stored) == _SHA256_TEMPLATE.digest_size * 2:
+                return bytes.fromhex(stored)
+            return base64.b64decode(stored, validate=True)
+        except (TypeError, ValueError, binascii.Error):
+            return None
 
     def _local_load(self) -> dict:
-        if self.local_users.exists():
-            try:
-                return json.loads(self.local_users.read_text(encoding="utf-8"))
-            except Exception:  # noqa: BLE001
-                LOGGER.exception("Failed to read local users file; resetting")
-        return {}
+        """Return the local users, re-parsing the file only when it changed on disk."""
+
+        try:
+            mtime = self.local_users.stat().st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        if mtime == self._local_mtime:
+            return dict(self._local_data)
+        try:
+            raw = self.local_users.read_bytes()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        except Exception:  # noqa: BLE001
+            LOGGER.exception("Failed to read local users file; resetting")
+            return {}
+        self._local_data = data
+        self._local_mtime = mtime
+        return dict(data)
 
     def _local_save(self, data: dict) -> None:
         self.storage_dir.mkdir(parents=True, exist_ok=True)
-        self.local_users.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        if orjson is not None:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(data, indent=2).encode("utf-8")
+        # Write beside the target and rename so a crash never leaves a truncated file.
+        tmp = self.local_users.with_suffix(".json.tmp")
+        tmp.write_bytes(payload)
+        os.replace(tmp, self.local_users)
+        self._local_data = dict(data)
+        self._local_mtime = self.local_users.stat().st_mtime_ns
+
+    def _remote_hash(self, email: str) -> Optional[bytes]:
+        """Fetch the stored Firestore hash, reusing lookups younger than ``REMOTE_CACHE_TTL``."""
+
+        cached = self._remote_cache.get(email)
+        now = time.monotonic()
+        if cached is not None and now - cached[1] < REMOTE_CACHE_TTL:
+            return cached[0]
+        doc = self._firestore.collection("users").document(email).get()
+        stored = self._decode(doc.to_dict().get("password_hash")) if doc.exists else None
+        self._remote_cache[email] = (stored, now)
+        return stored
 
     def sign_up(self, email: str, password: str) -> str:
         """Register a user in Firebase or locally; returns user id."""
 
         hashed = self._hash(password)
+        self._user_cache[email] = hashed
+        self._remote_cache.pop(email, None)
         if self._firestore:
             try:
                 doc_ref = self._firestore.collection("users").document(email)
-                doc_ref.set({"email": email, "password_hash": hashed})
+                doc_ref.set({"email": email, "password_hash": self._encode(hashed)})
                 return email
             except Exception:  # noqa: BLE001
                 LOGGER.exception("Firebase sign-up failed; falling back to local")
 
         data = self._local_load()
-        data[email] = hashed
+        data[email] = self._encode(hashed)
         self._local_save(data)
         return email
 
@@ -81,16 +159,21 @@ class FirebaseAuthManager:
         """Authenticate against Firebase or local store."""
 
         hashed = self._hash(password)
+        cached = self._user_cache.get(email)
+        if cached is not None and hmac.compare_digest(cached, hashed):
+            return email
         if self._firestore:
             try:
-                doc = self._firestore.collection("users").document(email).get()
-                if doc.exists and doc.to_dict().get("password_hash") == hashed:
+                stored = self._remote_hash(email)
+                if stored is not None and hmac.compare_digest(stored, hashed):
+                    self._user_cache[email] = stored
                     return email
             except Exception:  # noqa: BLE001
                 LOGGER.exception("Firebase sign-in failed; trying local store")
 
-        data = self._local_load()
-        if data.get(email) == hashed:
+        stored = self._decode(self._local_load().get(email))
+        if stored is not None and hmac.compare_digest(stored, hashed):
+            self._user_cache[email] = stored
             return email
         return None
 
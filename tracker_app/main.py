@@ -1,8 +1,10 @@
 """Application entry point for Study Tracker (wxPython edition)."""
 from __future__ import annotations
 
+import functools
 import importlib.util
 import logging
+import multiprocessing
 import sys
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
@@ -20,37 +22,43 @@ if TYPE_CHECKING:  # pragma: no cover - hints only
     from tracker_app.tracker.controllers import AppController, ConfigManager
     from tracker_app.tracker.storage import Storage
     from tracker_app.tracker.timers import TimerManager
-    from reports.excel_export import ExcelExporter
     from tracker_app.tracker.views.main_window import StudyTrackerApp
 
 AppController = None
 ConfigManager = None
 Storage = None
 TimerManager = None
-ExcelExporter = None
 StudyTrackerApp = None
 
 LOG_DIR = Path.home() / ".study_tracker" / "logs"
-LOG_DIR.mkdir(parents=True, exist_ok=True)
 LOG_FILE = LOG_DIR / "app.log"
+API_KEYS_FILE = Path.home() / ".study_tracker" / "api_keys.toml"
+
+
+@functools.lru_cache(maxsize=1)
+def _read_api_keys(path: Path, mtime_ns: int) -> dict:
+    """Parse the key file; ``mtime_ns`` is only part of the cache key."""
+
+    return tomllib.loads(path.read_text(encoding="utf-8"))
 
 
 def _load_api_keys() -> None:
     """Load Gemini and Firebase credentials from a local TOML file if present."""
 
-    config_dir = Path.home() / ".study_tracker"
-    candidate = config_dir / "api_keys.toml"
-    if not candidate.exists():
+    if os.getenv("GEMINI_API_KEY") and os.getenv("FIREBASE_CREDENTIALS"):
+        return
+    try:
+        mtime_ns = API_KEYS_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
         # Do not parse the bundled example file because it intentionally contains
         # placeholders that are not valid TOML. Users can copy the example to
         # ~/.study_tracker/api_keys.toml and fill in their own secrets.
         logging.info("No api_keys.toml found; skipping optional Gemini/Firebase config")
         return
-    path = candidate
     try:
-        data = tomllib.loads(path.read_text(encoding="utf-8"))
+        data = _read_api_keys(API_KEYS_FILE, mtime_ns)
     except Exception:
-        logging.exception("Unable to read API key file %s", path)
+        logging.exception("Unable to read API key file %s", API_KEYS_FILE)
         return
 
     gemini_key = data.get("gemini_api_key")
@@ -81,39 +89,43 @@ def load_runtime_modules() -> None:
 
     ensure_wx_dependencies()
 
-    global AppController, ConfigManager, Storage, TimerManager, ExcelExporter, StudyTrackerApp
+    global AppController, ConfigManager, Storage, TimerManager, StudyTrackerApp
     from tracker_app.tracker.controllers import AppController as _AppController, ConfigManager as _ConfigManager
     from tracker_app.tracker.storage import Storage as _Storage
     from tracker_app.tracker.timers import TimerManager as _TimerManager
-    from reports.excel_export import ExcelExporter as _ExcelExporter
     from tracker_app.tracker.views.main_window import StudyTrackerApp as _StudyTrackerApp
 
     AppController = _AppController
     ConfigManager = _ConfigManager
     Storage = _Storage
     TimerManager = _TimerManager
-    ExcelExporter = _ExcelExporter
     StudyTrackerApp = _StudyTrackerApp
 
 
 def configure_logging() -> None:
-    handler = RotatingFileHandler(LOG_FILE, maxBytes=1024 * 1024, backupCount=3)
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-        handlers=[handler, logging.StreamHandler()],
-    )
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    # delay=True: the log file is only opened once something is actually logged.
+    handlers: list[logging.Handler] = [
+        RotatingFileHandler(LOG_FILE, maxBytes=1024 * 1024, backupCount=3, delay=True)
+    ]
+    # Echo to the console only for interactive runs; detached launches log to file alone.
+    if sys.stderr is not None and sys.stderr.isatty():
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    logging.basicConfig(level=logging.INFO, handlers=handlers)
     logging.info("Study Tracker v%s starting", __version__)
 
 
 def build_controller(config_manager: ConfigManager) -> AppController:
-    if not all([AppController, ConfigManager, Storage, TimerManager, ExcelExporter]):
+    if not all([AppController, ConfigManager, Storage, TimerManager]):
         raise RuntimeError("wx modules not loaded; call load_runtime_modules() first.")
 
     storage = Storage(Path.home() / ".study_tracker" / "data.db")
-    exporter = ExcelExporter(Path(config_manager.config.export_path))
     timers = TimerManager()
-    return AppController(storage, timers, exporter, config_manager)
+    # The Excel exporter is created by the controller on first export.
+    return AppController(storage, timers, None, config_manager)
 
 
 def main() -> None:
@@ -123,8 +135,13 @@ def main() -> None:
     config_manager = ConfigManager()
     controller = build_controller(config_manager)
     app = StudyTrackerApp(controller, config_manager)
-    app.run()
+    try:
+        app.run()
+    finally:
+        controller.storage.close()
 
 
 if __name__ == "__main__":
+    # Background Excel exports use a worker process; required for frozen Windows builds.
+    multiprocessing.freeze_support()
     main()
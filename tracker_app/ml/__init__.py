@@ -1,2 +1,2 @@
-"""TensorFlow AI helper package with graceful fallbacks."""
+"""Gemini and scikit-learn AI helper package with graceful fallbacks."""
 
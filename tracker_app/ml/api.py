@@ -1,52 +1,91 @@
 """Public API for AI-powered features with Gemini-first fallbacks."""
 from __future__ import annotations
 
+import functools
 import logging
+import time
+from collections import OrderedDict
 from datetime import date
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from . import data_pipeline, models
+from . import data_pipeline
 from . import gemini_client
 
 LOGGER = logging.getLogger(__name__)
 PRIORITY_LABELS = ["Low", "Medium", "High", "Critical"]
-
-try:  # TensorFlow optional
-    import tensorflow as tf
-except Exception:  # noqa: BLE001
-    tf = None  # type: ignore
+PRIORITY_RANK = {label: i for i, label in enumerate(PRIORITY_LABELS)}
 
 MODELS_DIR = Path(__file__).resolve().parent / "models_store"
 MODELS_DIR.mkdir(parents=True, exist_ok=True)
+DURATION_MODEL_PATH = MODELS_DIR / "duration_model.joblib"
+PRIORITY_MODEL_PATH = MODELS_DIR / "priority_model.joblib"
+
+GEMINI_CACHE_TTL = 600.0
+GEMINI_CACHE_SIZE = 256
+_GEMINI_DURATIONS: "OrderedDict[Tuple[str, str, str, str], Tuple[float, float]]" = OrderedDict()
 
 
 def _load_model(path: Path) -> Optional[Any]:
-    if tf is None or not path.exists():
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
         return None
+    return _load_model_cached(path, mtime_ns)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_model_cached(path: Path, mtime_ns: int) -> Optional[Any]:
+    """Keep loaded models in memory; a retrained model changes ``mtime_ns`` and reloads."""
+
     try:
-        return tf.keras.models.load_model(path)
+        # Imported here so the app only pays for joblib/scikit-learn once a model exists.
+        import joblib
+
+        return joblib.load(path)
     except Exception:  # noqa: BLE001
         LOGGER.exception("Failed to load model at %s", path)
         return None
 
 
+def _cached_gemini_duration(title: str, description: str, category: str, priority: str) -> Optional[float]:
+    """Reuse recent Gemini duration guesses for identical inputs (e.g. a user tweaking a form)."""
+
+    key = (title, description, category, priority)
+    now = time.monotonic()
+    hit = _GEMINI_DURATIONS.get(key)
+    if hit is not None and now - hit[1] < GEMINI_CACHE_TTL:
+        _GEMINI_DURATIONS.move_to_end(key)
+        return hit[0]
+    guess = gemini_client.suggest_duration(title, description, category, priority)
+    if guess is not None:
+        # Failures are not cached so a later call can retry the API.
+        _GEMINI_DURATIONS[key] = (guess, now)
+        _GEMINI_DURATIONS.move_to_end(key)
+        while len(_GEMINI_DURATIONS) > GEMINI_CACHE_SIZE:
+            _GEMINI_DURATIONS.popitem(last=False)
+    return guess
+
+
 def predict_duration(title: str, description: str, category: str, priority: str) -> Optional[float]:
-    """Predict duration using Gemini when available with TF fallback."""
+    """Predict duration using Gemini when available with a local model fallback."""
 
-    gemini_guess = gemini_client.suggest_duration(title, description, category, priority)
+    if not (title or description):
+        # Nothing for Gemini or the model to work with; this is the heuristic's floor.
+        return 0.5
+    gemini_guess = _cached_gemini_duration(title, description, category, priority)
     if gemini_guess is not None:
         return gemini_guess
 
-    model = _load_model(MODELS_DIR / "duration_model")
+    model = _load_model(DURATION_MODEL_PATH)
     if model is None:
-        LOGGER.info("Duration model not available; returning heuristic")
+        LOGGER.debug("Duration model not available; returning heuristic")
         return max(0.5, min(4.0, (len(description) + len(title)) / 120.0))
 
     record = data_pipeline.TaskRecord(title, description, category, priority, 1.0, 0.0, 0)
     features = data_pipeline.build_task_matrix([record])
-    prediction = model.predict(features, verbose=0)[0][0]
-    return float(prediction)
+    return float(model.predict(features)[0])
 
 
 def suggest_priority(task: Dict[str, Any]) -> str:
@@ -54,9 +93,9 @@ def suggest_priority(task: Dict[str, Any]) -> str:
     if gemini_pick:
         return gemini_pick
 
-    model = _load_model(MODELS_DIR / "priority_model")
+    model = _load_model(PRIORITY_MODEL_PATH)
     if model is None:
-        LOGGER.info("Priority model not available; returning heuristic")
+        LOGGER.debug("Priority model not available; returning heuristic")
         due_date: Optional[date] = task.get("due_date")
         if due_date and (due_date - date.today()).days <= 1:
             return "Critical"
@@ -72,8 +111,7 @@ def suggest_priority(task: Dict[str, Any]) -> str:
         0,
     )
     features = data_pipeline.build_task_matrix([record])
-    logits = model.predict(features, verbose=0)[0]
-    idx = int(max(enumerate(logits), key=lambda kv: kv[1])[0])
+    idx = int(model.predict(features)[0])
     return PRIORITY_LABELS[idx]
 
 
@@ -82,8 +120,14 @@ def generate_daily_plan(target_date: date, tasks: Iterable[Dict[str, Any]], hist
     if gemini_plan:
         return gemini_plan
 
-    tasks_list = list(tasks)
-    tasks_list.sort(key=lambda t: (t.get("due_date") or target_date, PRIORITY_LABELS.index(t.get("priority", "Medium"))))
+    # Decorate once so the sort compares plain tuples; the index keeps it stable
+    # and ensures the task dicts themselves are never compared.
+    keyed = [
+        (t.get("due_date") or target_date, PRIORITY_RANK.get(t.get("priority", "Medium"), 1), i, t)
+        for i, t in enumerate(tasks)
+    ]
+    keyed.sort(key=itemgetter(0, 1, 2))
+    tasks_list = [k[3] for k in keyed]
     start_hour = 9
     plan = []
     for task in tasks_list:
@@ -93,18 +137,25 @@ def generate_daily_plan(target_date: date, tasks: Iterable[Dict[str, Any]], hist
 
 
 def analyze_patterns(history: List[Dict[str, Any]]) -> List[str]:
+    if not history:
+        return ["No history yet. Track tasks to unlock insights."]
     gemini_insights = gemini_client.analyze_patterns(history)
     if gemini_insights:
         return gemini_insights
 
+    has_long = has_deferrals = False
+    for h in history:
+        if not has_long and h.get("actual_duration", 0) > h.get("estimated_duration", 0) * 1.5:
+            has_long = True
+        if not has_deferrals and h.get("status") == "TODO" and h.get("deferrals", 0) > 2:
+            has_deferrals = True
+        if has_long and has_deferrals:
+            break
+
     messages = []
-    if not history:
-        return ["No history yet. Track tasks to unlock insights."]
-    long_tasks = [h for h in history if h.get("actual_duration", 0) > h.get("estimated_duration", 0) * 1.5]
-    if long_tasks:
+    if has_long:
         messages.append("Several tasks are underestimated; consider splitting them.")
-    repeat_deferrals = [h for h in history if h.get("status") == "TODO" and h.get("deferrals", 0) > 2]
-    if repeat_deferrals:
+    if has_deferrals:
         messages.append("Tasks are postponed often. Try planning shorter sessions.")
     if not messages:
         messages.append("Great consistency! Keep planning with realistic estimates.")
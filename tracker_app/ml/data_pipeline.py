@@ -1,15 +1,19 @@
-"""Data preparation helpers for TensorFlow models.
+"""Data preparation helpers for the task models.
 
-The helpers are intentionally lightweight and avoid importing TensorFlow
-so core/infra tests can run without the dependency being present.
+The helpers are intentionally lightweight and only depend on NumPy, avoiding
+scikit-learn so core/infra tests can run without it being present.
 """
 from __future__ import annotations
 
+import threading
+import zlib
 from dataclasses import dataclass
-from typing import Iterable, List, Sequence
+from typing import Dict, Iterable, List, Optional, Sequence
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class TaskRecord:
     """Flattened task record used by model training and inference."""
 
@@ -22,30 +26,68 @@ class TaskRecord:
     completion_flag: int
 
 
-def build_task_matrix(records: Sequence[TaskRecord]) -> List[List[float]]:
-    """Convert task records into numeric feature rows.
+PRIORITY_MAP = {"Low": 0.0, "Medium": 1.0, "High": 2.0, "Critical": 3.0}
+FEATURE_COUNT = 5
+MAX_CATEGORIES = 4096
+
+# Shared across calls so a category keeps its code between training and single-record inference.
+_CATEGORY_MAP: Dict[str, float] = {}
+_CATEGORY_LOCK = threading.Lock()
+
+
+def _fill_numeric(out: np.ndarray, records: Sequence[TaskRecord]) -> None:
+    """Write the length, priority and duration columns of ``out`` in place."""
+
+    count = len(records)
+    out[:, 0] = np.fromiter((len(r.title) for r in records), dtype=np.float32, count=count)
+    out[:, 0] /= 100.0
+    out[:, 1] = np.fromiter((len(r.description) for r in records), dtype=np.float32, count=count)
+    out[:, 1] /= 200.0
+    out[:, 3] = np.fromiter((PRIORITY_MAP.get(r.priority, 1.0) for r in records), dtype=np.float32, count=count)
+    out[:, 4] = np.fromiter((r.estimated_duration for r in records), dtype=np.float32, count=count)
+
+
+def _encode_categoricals(categories: Sequence[str], category_map: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """Map categories to codes, numbering unseen ones in first-seen order.
+
+    Once ``MAX_CATEGORIES`` codes are assigned, new categories fall back to a
+    stable CRC32 bucket instead of growing the map further.
+    """
+
+    mapping = _CATEGORY_MAP if category_map is None else category_map
+    unique, first_seen, inverse = np.unique(np.array(categories, dtype=object), return_index=True, return_inverse=True)
+    codes = np.empty(len(unique), dtype=np.float32)
+    with _CATEGORY_LOCK:
+        for idx in np.argsort(first_seen):
+            category = unique[idx]
+            code = mapping.get(category)
+            if code is None:
+                if len(mapping) < MAX_CATEGORIES:
+                    code = mapping[category] = float(len(mapping))
+                else:
+                    code = float(zlib.crc32(category.encode("utf-8")) % MAX_CATEGORIES)
+            codes[idx] = code
+    return codes[inverse.ravel()]
+
+
+def build_task_matrix(
+    records: Sequence[TaskRecord], category_map: Optional[Dict[str, float]] = None
+) -> np.ndarray:
+    """Convert task records into a ``float32`` feature matrix.
 
     The encoding is intentionally simple to keep the model lightweight and
     portable. Real deployments can swap in embeddings or richer text
-    processing without changing callers.
+    processing without changing callers. ``category_map`` overrides the
+    process-wide category encoding (mainly for tests).
     """
 
-    priority_map = {"Low": 0.0, "Medium": 1.0, "High": 2.0, "Critical": 3.0}
-    category_map = {}
-    rows: List[List[float]] = []
-    for record in records:
-        cat_val = category_map.setdefault(record.category, float(len(category_map)))
-        priority_val = priority_map.get(record.priority, 1.0)
-        rows.append(
-            [
-                len(record.title) / 100.0,
-                len(record.description) / 200.0,
-                cat_val,
-                priority_val,
-                record.estimated_duration,
-            ]
-        )
-    return rows
+    count = len(records)
+    out = np.empty((count, FEATURE_COUNT), dtype=np.float32)
+    if not count:
+        return out
+    _fill_numeric(out, records)
+    out[:, 2] = _encode_categoricals([r.category for r in records], category_map)
+    return out
 
 
 def completion_labels(records: Iterable[TaskRecord]) -> List[float]:
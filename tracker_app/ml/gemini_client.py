@@ -6,13 +6,35 @@ callers should handle ``None`` responses and fall back to heuristics.
 """
 from __future__ import annotations
 
+import functools
+import hashlib
+import json
 import logging
 import os
+import re
+import sqlite3
+import time
+from contextlib import closing
 from datetime import date
-from typing import Any, Dict, Iterable, List, Optional
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
 LOGGER = logging.getLogger(__name__)
 
+CACHE_PATH = Path.home() / ".study_tracker" / "gemini_cache.db"
+# Task-level answers stay useful for a day; plans and insights go stale faster.
+TASK_CACHE_TTL = 24 * 3600.0
+SUMMARY_CACHE_TTL = 3600.0
+# Entries sent verbatim to analyze_patterns; older ones are folded into per-task totals.
+HISTORY_PROMPT_LIMIT = 200
+
+# Set once the installed SDK rejects ``service_tier`` so later calls skip the attempt.
+_TIERS_UNSUPPORTED = False
+
+_NUMBERED_LINE_RE = re.compile(r"^\W*(\d+)\s*[:.)\-]\s*(.*)$")
+_NUMBER_RE = re.compile(r"\d*[.,]?\d+")
+_PRIORITY_RE = re.compile(r"\b(critical|high|medium|low)\b", re.IGNORECASE)
+
 try:  # pragma: no cover - optional dependency
     import google.generativeai as genai
 except Exception:  # noqa: BLE001
@@ -27,6 +49,13 @@ def _client() -> Optional[Any]:
     api_key = os.getenv("GEMINI_API_KEY")
     if not api_key:
         return None
+    return _configured_model(api_key)
+
+
+@functools.lru_cache(maxsize=1)
+def _configured_model(api_key: str) -> Optional[Any]:
+    """Configure the SDK once per API key; use ``_configured_model.cache_clear()`` to reset."""
+
     try:
         genai.configure(api_key=api_key)
         return genai.GenerativeModel("gemini-pro")
@@ -35,6 +64,64 @@ def _client() -> Optional[Any]:
         return None
 
 
+def _collect(stream: Iterable[Any]) -> str:
+    """Join the text of streamed response chunks."""
+
+    return "".join(getattr(chunk, "text", "") or "" for chunk in stream)
+
+
+def _generate(model: Any, prompt: str, tier: str = "standard") -> str:
+    """Stream ``generate_content`` for ``prompt``, asking for ``tier`` when it is not the standard one.
+
+    The pinned google-generativeai SDK has no ``service_tier`` request option:
+    ``RequestOptions`` rejects it with ``TypeError``, which turns tier requests
+    off for the process, so in practice every call runs at the standard tier.
+    If an SDK does accept the option and the tier request fails, it is retried
+    once at the standard tier.
+    """
+
+    global _TIERS_UNSUPPORTED
+    if tier != "standard" and not _TIERS_UNSUPPORTED:
+        try:
+            return _collect(model.generate_content(prompt, stream=True, request_options={"service_tier": tier}))
+        except TypeError:
+            _TIERS_UNSUPPORTED = True
+        except Exception:  # noqa: BLE001
+            LOGGER.warning("Gemini %s tier request failed; retrying at standard tier", tier, exc_info=True)
+    return _collect(model.generate_content(prompt, stream=True))
+
+
+def _cached_generate(model: Any, prompt: str, ttl: float, tier: str = "standard") -> str:
+    """Return the response text for ``prompt``, reusing a stored answer younger than ``ttl``.
+
+    Responses are keyed by the SHA-256 of the exact prompt. Empty responses
+    are never stored, and cache I/O errors fall through to a live request.
+    """
+
+    key = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    now = time.time()
+    try:
+        with closing(sqlite3.connect(CACHE_PATH)) as conn, conn:
+            row = conn.execute("SELECT text, created FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is not None and now - row[1] < ttl:
+            return row[0]
+    except sqlite3.Error:
+        pass  # Table missing on first use or cache unreadable; ask Gemini.
+
+    text = _generate(model, prompt, tier)
+    if text:
+        try:
+            CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with closing(sqlite3.connect(CACHE_PATH)) as conn, conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, text TEXT NOT NULL, created REAL NOT NULL)"
+                )
+                conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)", (key, text, now))
+        except sqlite3.Error:
+            LOGGER.warning("Could not store Gemini response in %s", CACHE_PATH, exc_info=True)
+    return text
+
+
 def suggest_duration(title: str, description: str, category: str, priority: str) -> Optional[float]:
     model = _client()
     if model is None:
@@ -46,12 +133,10 @@ def suggest_duration(title: str, description: str, category: str, priority: str)
         "Reply with a single number of hours (float)."
     )
     try:
-        result = model.generate_content(prompt)
-        if not result or not result.text:
+        text = _cached_generate(model, prompt, TASK_CACHE_TTL)
+        if not text:
             return None
-        numeric = "".join(ch for ch in result.text if ch.isdigit() or ch in {".", ","})
-        numeric = numeric.replace(",", ".")
-        return float(numeric) if numeric else None
+        return _parse_duration(text)
     except Exception:  # noqa: BLE001
         LOGGER.exception("Gemini duration suggestion failed")
         return None
@@ -69,19 +154,85 @@ def suggest_priority(task: Dict[str, Any]) -> Optional[str]:
         f"Due date: {due}."
     )
     try:
-        result = model.generate_content(prompt)
-        if not result or not result.text:
+        text = _cached_generate(model, prompt, TASK_CACHE_TTL)
+        if not text:
             return None
-        text = result.text.lower()
-        for label in ("critical", "high", "medium", "low"):
-            if label in text:
-                return label.capitalize()
-        return None
+        return _parse_priority(text)
     except Exception:  # noqa: BLE001
         LOGGER.exception("Gemini priority suggestion failed")
         return None
 
 
+def suggest_duration_bulk(tasks: Sequence[Dict[str, Any]]) -> List[Optional[float]]:
+    """Estimate hours for many tasks with a single request; ``None`` marks unanswered tasks."""
+
+    model = _client()
+    if model is None or not tasks:
+        return [None] * len(tasks)
+    listing = "\n".join(
+        f"{i}. Title: {t.get('title', '')}; Description: {t.get('description', '')}; "
+        f"Category: {t.get('category', '')}; Priority: {t.get('priority', 'Medium')}"
+        for i, t in enumerate(tasks, 1)
+    )
+    prompt = (
+        "Estimate hours for each numbered task given past trends. "
+        "Reply with one line per task formatted as '<number>: <hours>'.\n" + listing
+    )
+    try:
+        answers = _numbered_answers(_cached_generate(model, prompt, TASK_CACHE_TTL), len(tasks))
+        return [_parse_duration(answer) if answer else None for answer in answers]
+    except Exception:  # noqa: BLE001
+        LOGGER.exception("Gemini bulk duration suggestion failed")
+        return [None] * len(tasks)
+
+
+def suggest_priority_bulk(tasks: Sequence[Dict[str, Any]]) -> List[Optional[str]]:
+    """Suggest priorities for many tasks with a single request; ``None`` marks unanswered tasks."""
+
+    model = _client()
+    if model is None or not tasks:
+        return [None] * len(tasks)
+    listing = "\n".join(
+        f"{i}. Title: {t.get('title', '')}; Category: {t.get('category', '')}; Due date: {t.get('due_date')}"
+        for i, t in enumerate(tasks, 1)
+    )
+    prompt = (
+        "Suggest a priority (Low, Medium, High, Critical) for each numbered task. "
+        "Reply with one line per task formatted as '<number>: <priority>'.\n" + listing
+    )
+    try:
+        answers = _numbered_answers(_cached_generate(model, prompt, TASK_CACHE_TTL), len(tasks))
+        return [_parse_priority(answer) if answer else None for answer in answers]
+    except Exception:  # noqa: BLE001
+        LOGGER.exception("Gemini bulk priority suggestion failed")
+        return [None] * len(tasks)
+
+
+def _numbered_answers(text: str, count: int) -> List[Optional[str]]:
+    """Split a '<number>: <answer>' reply into a list indexed by task position."""
+
+    answers: List[Optional[str]] = [None] * count
+    for line in text.splitlines():
+        match = _NUMBERED_LINE_RE.match(line)
+        if match and 1 <= int(match.group(1)) <= count:
+            answers[int(match.group(1)) - 1] = match.group(2)
+    return answers
+
+
+def _parse_duration(text: str) -> Optional[float]:
+    """Return the first number in ``text`` (decimal comma allowed), or None."""
+
+    match = _NUMBER_RE.search(text)
+    return float(match.group(0).replace(",", ".")) if match else None
+
+
+def _parse_priority(text: str) -> Optional[str]:
+    """Return the first priority label mentioned as a whole word, or None."""
+
+    match = _PRIORITY_RE.search(text)
+    return match.group(1).capitalize() if match else None
+
+
 def generate_daily_plan(target_date: date, tasks: Iterable[Dict[str, Any]], history: List[Dict[str, Any]]) -> List[Dict[str, str]]:
     model = _client()
     if model is None:
@@ -96,8 +247,8 @@ def generate_daily_plan(target_date: date, tasks: Iterable[Dict[str, Any]], hist
     )
     history_note = f"History entries: {len(history)}" if history else "No history yet."
     try:
-        result = model.generate_content(prompt + "\n" + task_text + "\n" + history_note)
-        lines = (result.text or "").splitlines() if result else []
+        text = _cached_generate(model, prompt + "\n" + task_text + "\n" + history_note, SUMMARY_CACHE_TTL, tier="flex")
+        lines = text.splitlines()
         plan = []
         for line in lines:
             if ":" in line:
@@ -118,11 +269,30 @@ def analyze_patterns(history: List[Dict[str, Any]]) -> List[str]:
         "based on this JSON history. Keep bullets short."
     )
     try:
-        result = model.generate_content(prompt + "\n" + str(history))
-        if not result or not result.text:
-            return []
-        return [line.strip("- ") for line in result.text.splitlines() if line.strip()]
+        text = _cached_generate(model, prompt + "\n" + _history_payload(history), SUMMARY_CACHE_TTL, tier="flex")
+        return [line.strip("- ") for line in text.splitlines() if line.strip()]
     except Exception:  # noqa: BLE001
         LOGGER.exception("Gemini pattern analysis failed")
         return []
 
+
+def _history_payload(history: List[Dict[str, Any]]) -> str:
+    """Serialize history as compact JSON, summarizing entries beyond ``HISTORY_PROMPT_LIMIT``."""
+
+    recent = history[-HISTORY_PROMPT_LIMIT:]
+    payload = _compact_json(recent)
+    older = history[:-HISTORY_PROMPT_LIMIT]
+    if not older:
+        return payload
+    totals: Dict[str, Dict[str, Any]] = {}
+    for entry in older:
+        title = entry.get("title", "")
+        summary = totals.setdefault(title, {"title": title, "entries": 0, "actual_hours": 0.0, "estimated_hours": 0.0})
+        summary["entries"] += 1
+        summary["actual_hours"] += entry.get("actual_duration", 0) or 0
+        summary["estimated_hours"] += entry.get("estimated_duration", 0) or 0
+    return f"Earlier totals by task: {_compact_json(list(totals.values()))}\nRecent entries: {payload}"
+
+
+def _compact_json(value: Any) -> str:
+    return json.dumps(value, default=str, separators=(",", ":"))
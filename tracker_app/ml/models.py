@@ -1,39 +1,31 @@
-"""TensorFlow model definitions with small, fast architectures."""
+"""scikit-learn model definitions for the small tabular task features."""
 from __future__ import annotations
 
-from typing import Any
+import functools
+from types import ModuleType
+from typing import Any, Optional
 
-try:  # TensorFlow is optional in some dev environments
-    import tensorflow as tf
-except Exception:  # noqa: BLE001
-    tf = None  # type: ignore
 
+@functools.lru_cache(maxsize=1)
+def _ensemble() -> Optional[ModuleType]:
+    """Import scikit-learn on first use; it is optional and slow to import."""
 
-def build_duration_model(input_dim: int) -> Any:
-    if tf is None:
+    try:
+        from sklearn import ensemble
+    except Exception:  # noqa: BLE001
         return None
-    model = tf.keras.Sequential(
-        [
-            tf.keras.layers.Input(shape=(input_dim,)),
-            tf.keras.layers.Dense(32, activation="relu"),
-            tf.keras.layers.Dense(16, activation="relu"),
-            tf.keras.layers.Dense(1, activation="linear"),
-        ]
-    )
-    model.compile(optimizer="adam", loss="mse")
-    return model
-
-
-def build_priority_model(input_dim: int) -> Any:
-    if tf is None:
+    return ensemble
+
+
+def build_duration_model() -> Any:
+    ensemble = _ensemble()
+    if ensemble is None:
         return None
-    model = tf.keras.Sequential(
-        [
-            tf.keras.layers.Input(shape=(input_dim,)),
-            tf.keras.layers.Dense(32, activation="relu"),
-            tf.keras.layers.Dense(4, activation="softmax"),
-        ]
-    )
-    model.compile(optimizer="adam", loss="sparse_categorical_crossentropy", metrics=["accuracy"])
-    return model
+    return ensemble.HistGradientBoostingRegressor(max_iter=50)
 
+
+def build_priority_model() -> Any:
+    ensemble = _ensemble()
+    if ensemble is None:
+        return None
+    return ensemble.HistGradientBoostingClassifier(max_iter=50)
@@ -1,42 +1,46 @@
-"""Minimal training entrypoints for TensorFlow models."""
+"""Minimal training entrypoints for the scikit-learn models."""
 from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Iterable
 
-from . import api, data_pipeline, models
+import numpy as np
 
-try:  # TensorFlow optional
-    import tensorflow as tf
-except Exception:  # noqa: BLE001
-    tf = None  # type: ignore
+from . import api, data_pipeline, models
 
 LOGGER = logging.getLogger(__name__)
 
 
+def _save(model: Any, path: Path) -> None:
+    import joblib  # ships with scikit-learn, so it is present once a model was built
+
+    joblib.dump(model, path)
+
+
 def train_duration(records: Iterable[data_pipeline.TaskRecord]) -> None:
-    if tf is None:
-        LOGGER.warning("TensorFlow not installed; skipping duration training")
+    model = models.build_duration_model()
+    if model is None:
+        LOGGER.warning("scikit-learn not installed; skipping duration training")
         return
-    rows = data_pipeline.build_task_matrix(list(records))
-    labels = data_pipeline.completion_labels(records)
-    model = models.build_duration_model(len(rows[0]))
-    model.fit(rows, labels, epochs=5, verbose=0)
-    model.save(api.MODELS_DIR / "duration_model")
+    records = list(records)
+    rows = data_pipeline.build_task_matrix(records)
+    # build_task_matrix already yields a contiguous float32 array; match the labels to it.
+    labels = np.asarray(data_pipeline.completion_labels(records), dtype=np.float32)
+    model.fit(rows, labels)
+    _save(model, api.DURATION_MODEL_PATH)
 
 
 def train_priority(records: Iterable[data_pipeline.TaskRecord]) -> None:
-    if tf is None:
-        LOGGER.warning("TensorFlow not installed; skipping priority training")
+    model = models.build_priority_model()
+    if model is None:
+        LOGGER.warning("scikit-learn not installed; skipping priority training")
         return
     rows = data_pipeline.build_task_matrix(list(records))
-    labels = [0 for _ in rows]
-    model = models.build_priority_model(len(rows[0]))
-    model.fit(rows, labels, epochs=5, verbose=0)
-    model.save(api.MODELS_DIR / "priority_model")
+    labels = np.zeros(len(rows), dtype=np.int32)
+    model.fit(rows, labels)
+    _save(model, api.PRIORITY_MODEL_PATH)
 
 
 if __name__ == "__main__":
     LOGGER.info("No CLI hooks yet; training should be invoked from scripts.")
-
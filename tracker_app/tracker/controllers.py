@@ -1,18 +1,25 @@
 """Controllers orchestrating UI, storage, timers, and exports."""
 from __future__ import annotations
 
+import heapq
 import logging
+import re
+import threading
+import time
 import tomllib
+from concurrent.futures import Future
 from dataclasses import dataclass, field
 from datetime import date
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, List, Optional
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+import numpy as np
 
 from . import __version__
 from .models import Activity, DailyEntry
 from .storage import Storage
 from .timers import FocusSessionManager, TimerManager
-from src.ai_integration import productivity_adapter
 if TYPE_CHECKING:
     from reports.excel_export import ExcelExporter
 
@@ -22,9 +29,27 @@ LOGGER = logging.getLogger(__name__)
 CONFIG_DIR = Path.home() / ".study_tracker"
 CONFIG_FILE = CONFIG_DIR / "config.toml"
 DEFAULT_CONFIG_PATH = Path(__file__).resolve().parent.parent / "config" / "default_config.toml"
+# Strings that can be written between TOML double quotes unchanged.
+_TOML_SAFE_RE = re.compile(r'[^"\\\n]*')
+# How long AppController.today trusts its cached date before asking the clock again.
+TODAY_RECHECK_SECONDS = 60.0
+# Config changes within this many seconds of each other are written to disk once.
+CONFIG_SAVE_DELAY = 0.5
+# Distinct date-range queries AppController keeps per storage version.
+RANGE_CACHE_SIZE = 32
+# Activities listed in the "category_hours" KPI, busiest first.
+KPI_TOP_CATEGORIES = 10
+
+
+def _toml_quote(value: str) -> str:
+    """Return ``value`` as a TOML basic string, escaping only when needed."""
 
+    if not _TOML_SAFE_RE.fullmatch(value):
+        value = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'"{value}"'
 
-@dataclass
+
+@dataclass(slots=True)
 class AppConfig:
     export_path: str
     default_range_days: int
@@ -75,56 +100,111 @@ class AppConfig:
             if self.last_selected_activity is not None
             else '""'
         )
-        lines = [
-            f"export_path = \"{self.export_path}\"",
-            f"default_range_days = {self.default_range_days}",
-            f"last_window_width = {self.last_window_width}",
-            f"last_window_height = {self.last_window_height}",
-            f"last_selected_activity = {last_activity_value}",
-            f"last_layout = \"{self.last_layout}\"",
-            f"last_workspace = \"{self.last_workspace}\"",
-            f"show_help_tips = {str(bool(self.show_help_tips)).lower()}",
-            f"user_id = \"{self.user_id}\"",
-            f"firebase_credentials = \"{self.firebase_credentials}\"",
-            f"show_focus_on_start = {str(bool(self.show_focus_on_start)).lower()}",
-            f"current_ongoing_task = {last_activity_value}",
-            f"task_queue = [{', '.join(str(t) for t in self.task_queue)}]",
-            f"auto_start_next_task = {str(bool(self.auto_start_next_task)).lower()}",
-        ]
-        return "\n".join(lines) + "\n"
+        show_help_tips = str(bool(self.show_help_tips)).lower()
+        show_focus_on_start = str(bool(self.show_focus_on_start)).lower()
+        auto_start_next_task = str(bool(self.auto_start_next_task)).lower()
+        task_queue = ", ".join(str(t) for t in self.task_queue)
+        return (
+            f"export_path = {_toml_quote(self.export_path)}\n"
+            f"default_range_days = {self.default_range_days}\n"
+            f"last_window_width = {self.last_window_width}\n"
+            f"last_window_height = {self.last_window_height}\n"
+            f"last_selected_activity = {last_activity_value}\n"
+            f"last_layout = {_toml_quote(self.last_layout)}\n"
+            f"last_workspace = {_toml_quote(self.last_workspace)}\n"
+            f"show_help_tips = {show_help_tips}\n"
+            f"user_id = {_toml_quote(self.user_id)}\n"
+            f"firebase_credentials = {_toml_quote(self.firebase_credentials)}\n"
+            f"show_focus_on_start = {show_focus_on_start}\n"
+            f"current_ongoing_task = {last_activity_value}\n"
+            f"task_queue = [{task_queue}]\n"
+            f"auto_start_next_task = {auto_start_next_task}\n"
+        )
+
+
+@lru_cache(maxsize=4)
+def _read_toml(path: Path, mtime_ns: int) -> dict:
+    """Parse a TOML file; ``mtime_ns`` is only part of the cache key."""
+
+    return tomllib.loads(path.read_text(encoding="utf-8"))
 
 
 class ConfigManager:
     def __init__(self) -> None:
         CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        # Serialized config as last read from or written to CONFIG_FILE.
+        self._serialized: Optional[str] = None
         self.config = self._load()
 
     def _load(self) -> AppConfig:
-        if CONFIG_FILE.exists():
-            with open(CONFIG_FILE, "rb") as fh:
-                data = tomllib.load(fh)
-                return AppConfig.from_toml(data)
-        with open(DEFAULT_CONFIG_PATH, "rb") as fh:
-            data = tomllib.load(fh)
-            config = AppConfig.from_toml(data)
+        try:
+            mtime_ns = CONFIG_FILE.stat().st_mtime_ns
+        except FileNotFoundError:
+            config = AppConfig.from_toml(_read_toml(DEFAULT_CONFIG_PATH, DEFAULT_CONFIG_PATH.stat().st_mtime_ns))
             self.save(config)
             return config
+        config = AppConfig.from_toml(_read_toml(CONFIG_FILE, mtime_ns))
+        self._serialized = config.to_toml()
+        return config
 
     def save(self, config: Optional[AppConfig] = None) -> None:
         cfg = config or self.config
+        text = cfg.to_toml()
+        if text == self._serialized and CONFIG_FILE.exists():
+            return
         CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-        CONFIG_FILE.write_text(cfg.to_toml(), encoding="utf-8")
+        CONFIG_FILE.write_text(text, encoding="utf-8")
+        self._serialized = text
         LOGGER.info("Saved configuration to %s", CONFIG_FILE)
 
 
+def _fmt(value: Optional[float], spec: str, suffix: str = "") -> str:
+    """Format an optional KPI value, using "N/A" when it could not be computed."""
+
+    return "N/A" if value is None else format(value, spec) + suffix
+
+
+# (key, format spec, suffix) for each KPI get_kpis reports; None values read "N/A".
+_KPI_FORMATS = (
+    ("planned_vs_actual", ".0f", "%"),
+    ("focus_ratio", ".0f", "%"),
+    ("category_hours", "s", ""),
+    ("switches", "d", ""),
+    ("switch_load", ".1f", "/day"),
+    ("overtime", ".1f", "h"),
+    ("completion_rate", ".0f", "%"),
+    ("avg_task_duration", ".2f", "h"),
+    ("productivity_score", ".1f", ""),
+    ("efficiency_index", ".2f", "x"),
+    ("task_velocity", ".2f", "/day"),
+    ("capacity_forecast", ".1f", "h next week"),
+    ("focus_quality", ".0f", "%"),
+    ("interruption_cost", ".0f", " min"),
+    ("category_accuracy", "s", ""),
+    ("time_drift", "+.1f", "h vs plan"),
+    ("consistency_score", ".0f", "%"),
+    ("habit_streak", "d", ""),
+    ("procrastination_flags", "d", ""),
+    ("flow_efficiency", ".0f", "%"),
+)
+
+
 class AppController:
-    def __init__(self, storage: Storage, timers: TimerManager, exporter: ExcelExporter, config_manager: ConfigManager) -> None:
+    def __init__(
+        self,
+        storage: Storage,
+        timers: TimerManager,
+        exporter: Optional[ExcelExporter],
+        config_manager: ConfigManager,
+    ) -> None:
         self.storage = storage
         self.timers = timers
         self.focus_sessions = FocusSessionManager()
-        self.exporter = exporter
+        if exporter is not None:
+            self.exporter = exporter
         self.config_manager = config_manager
-        self.today = date.today()
+        self._today = date.today()
+        self._today_checked = time.monotonic()
         self.current_ongoing_task: Optional[int] = config_manager.config.current_ongoing_task
         self.task_queue: list[int] = [
             t
@@ -132,10 +212,40 @@ class AppController:
             if any(a.id == t for a in self.storage.get_activities())
         ]
         self.auto_start_next_task: bool = bool(config_manager.config.auto_start_next_task)
+        # Bumped on every activity mutation so callers can cache derived task lists.
+        self._activities_rev = 0
+        # Query results for the current storage version, keyed by (query, *args).
+        self._query_cache: Dict[tuple, object] = {}
+        self._query_cache_version = -1
+        self._config_save_timer: Optional[threading.Timer] = None
+        self._config_save_lock = threading.Lock()
+
+    @cached_property
+    def exporter(self) -> ExcelExporter:
+        """Build the Excel exporter on first use so startup skips its imports."""
+        from reports.excel_export import ExcelExporter
+
+        return ExcelExporter(Path(self.config_manager.config.export_path))
+
+    def _cached_query(self, query: Callable, *args):
+        """Return ``query(*args)``, reusing the result until the storage is written to.
+
+        Every caller gets the same cached object, so results must not be mutated.
+        """
+
+        if self._query_cache_version != self.storage.version or len(self._query_cache) >= RANGE_CACHE_SIZE:
+            self._query_cache.clear()
+            self._query_cache_version = self.storage.version
+        key = (query.__name__, *args)
+        try:
+            return self._query_cache[key]
+        except KeyError:
+            result = self._query_cache[key] = query(*args)
+            return result
 
     # Activity management
     def list_activities(self) -> List[Activity]:
-        return self.storage.get_activities()
+        return self._cached_query(self.storage.get_activities)
 
     def add_activity(
         self,
@@ -145,13 +255,15 @@ class AppController:
         tags: str = "",
         priority: str = "Medium",
     ) -> Activity:
-        return self.storage.create_activity(
+        activity = self.storage.create_activity(
             name,
             description=description,
             default_target_hours=default_target_hours,
             tags=tags,
             priority=priority,
         )
+        self._activities_rev += 1
+        return activity
 
     def update_activity(
         self,
@@ -172,6 +284,7 @@ class AppController:
             tags=tags,
             priority=priority,
         )
+        self._activities_rev += 1
 
     def duplicate_activity(self, activity_id: int) -> Optional[Activity]:
         activities = {a.id: a for a in self.storage.get_activities()}
@@ -194,6 +307,7 @@ class AppController:
 
     def delete_activity(self, activity_id: int) -> None:
         self.storage.delete_activity(activity_id)
+        self._activities_rev += 1
 
     def delete_daily_entry(self, entry_date: date, activity_id: int) -> None:
         """Delete a specific entry for a date/activity pair."""
@@ -239,7 +353,7 @@ class AppController:
     def set_ongoing_task(self, activity_id: Optional[int]) -> None:
         self.current_ongoing_task = activity_id
         self.config_manager.config.current_ongoing_task = activity_id
-        self.config_manager.save()
+        self._schedule_config_save()
 
     def get_ongoing_task(self) -> Optional[Activity]:
         if self.current_ongoing_task is None:
@@ -250,33 +364,33 @@ class AppController:
         if activity_id not in self.task_queue:
             self.task_queue.append(activity_id)
             self.config_manager.config.task_queue = self.task_queue
-            self.config_manager.save()
+            self._schedule_config_save()
 
     def remove_from_queue(self, activity_id: int) -> None:
         self.task_queue = [t for t in self.task_queue if t != activity_id]
         self.config_manager.config.task_queue = self.task_queue
-        self.config_manager.save()
+        self._schedule_config_save()
 
     def clear_queue(self) -> None:
         self.task_queue = []
         self.config_manager.config.task_queue = []
-        self.config_manager.save()
+        self._schedule_config_save()
 
     def next_from_queue(self) -> Optional[int]:
         while self.task_queue:
             nxt = self.task_queue.pop(0)
             if any(a.id == nxt for a in self.storage.get_activities()):
                 self.config_manager.config.task_queue = self.task_queue
-                self.config_manager.save()
+                self._schedule_config_save()
                 return nxt
         self.config_manager.config.task_queue = []
-        self.config_manager.save()
+        self._schedule_config_save()
         return None
 
     def set_auto_start_next(self, enabled: bool) -> None:
         self.auto_start_next_task = enabled
         self.config_manager.config.auto_start_next_task = enabled
-        self.config_manager.save()
+        self._schedule_config_save()
 
     def get_queue_activities(self) -> list[Activity]:
         activities = {a.id: a for a in self.storage.get_activities()}
@@ -380,71 +494,48 @@ class AppController:
         return self.storage.get_daily_entries_by_date(self.today)
 
     def get_entries_between(self, start_date: date, end_date: date):
-        return self.storage.get_entries_between(start_date, end_date)
+        return self._cached_query(self.storage.get_entries_between, start_date, end_date)
 
     def get_stats(self, start_date: date, end_date: date):
-        return self.storage.get_statistics_by_activity(start_date, end_date)
+        return self._cached_query(self.storage.get_statistics_by_activity, start_date, end_date)
 
     def get_kpis(self, start_date: date, end_date: date) -> Dict[str, str]:
         """Compute higher-level KPIs using stored entries."""
 
-        entries = self.get_entries_between(start_date, end_date)
-        if not entries:
+        # A copy, since callers may decorate the KPI dict they are handed.
+        return dict(self._cached_query(self._compute_kpis, start_date, end_date))
+
+    def _compute_kpis(self, start_date: date, end_date: date) -> Dict[str, str]:
+        days, activities = self.storage.get_kpi_aggregates(start_date, end_date)
+        if not days or not activities:
             return {}
 
-        def planned_per_day(row: tuple) -> float:
-            plan_total = row[8] if len(row) > 8 and row[8] is not None else row[4] if len(row) > 4 else 0.0
-            plan_days = row[9] if len(row) > 9 and row[9] else 1
-            target_hours = row[4] if len(row) > 4 and row[4] is not None else 0.0
-            if target_hours:
-                return target_hours
-            return (plan_total / plan_days) if plan_total else 0.0
-
-        per_day: Dict[str, set] = {}
-        daily_hours: Dict[str, float] = {}
-        daily_planned: Dict[str, float] = {}
-        plan_totals: Dict[str, float] = {}
-        for row in entries:
-            (
-                entry_date,
-                activity_name,
-                hours,
-                _obj,
-                target_hours,
-                completion_percent,
-                stop_reason,
-                comments,
-                plan_total_hours,
-                plan_days,
-            ) = (*row, 0, 1)[:10]
-            planned_value = target_hours if target_hours else (plan_total_hours / plan_days if plan_total_hours else 0.0)
-            daily_hours[entry_date] = daily_hours.get(entry_date, 0.0) + (hours or 0.0)
-            per_day.setdefault(entry_date, set()).add(activity_name)
-            daily_planned[entry_date] = daily_planned.get(entry_date, 0.0) + planned_value
-            plan_totals[entry_date] = plan_totals.get(entry_date, 0.0) + (plan_total_hours or target_hours or 0.0)
-
-        total_actual = sum(daily_hours.values())
-        total_planned = sum(daily_planned.values())
+        days_count = len(days)
+        daily_hours = np.array([row[1] for row in days], dtype=float)
+        (
+            hours, focused, tasks, completed, breaks, planned, ratio_sums, ratio_counts, over_plan
+        ) = np.array([row[2:11] for row in activities], dtype=float).T
+
+        total_actual = float(hours.sum())
+        total_planned = float(planned.sum())
         planned_vs_actual = (total_actual / total_planned * 100) if total_planned else None
 
-        focused_time = sum((row[2] or 0.0) * ((row[5] or 0.0) / 100) for row in entries)
+        focused_time = float(focused.sum())
         focus_ratio = (focused_time / total_actual * 100) if total_actual else None
 
-        # Time per category/activity
-        category_hours: Dict[str, float] = {}
-        for _date, activity_name, hours, *_rest in entries:
-            category_hours[activity_name] = category_hours.get(activity_name, 0.0) + (hours or 0.0)
+        # Time per category/activity, keeping only the busiest for the label
+        top_categories = heapq.nlargest(KPI_TOP_CATEGORIES, activities, key=lambda row: row[2])
 
-        # Task switching frequency and context switching load
-        switches = sum(max(0, len(names) - 1) for names in per_day.values())
-        days_count = max(len(per_day), 1)
+        # Task switching frequency and context switching load: every distinct
+        # activity beyond the first on a day counts as one switch.
+        switches = sum(row[2] for row in days) - days_count
         switch_load = switches / days_count
 
         # Overtime assumes 8h nominal day
-        overtime = sum(max(0.0, daily_hours.get(day, 0.0) - 8.0) for day in per_day)
+        overtime = float(np.maximum(daily_hours - 8.0, 0.0).sum())
 
-        total_tasks = len(entries)
-        completed_tasks = sum(1 for row in entries if (row[5] or 0.0) >= 100)
+        total_tasks = int(tasks.sum())
+        completed_tasks = int(completed.sum())
         completion_rate = (completed_tasks / total_tasks * 100) if total_tasks else None
         avg_task_duration = (total_actual / total_tasks) if total_tasks else None
 
@@ -457,77 +548,99 @@ class AppController:
         if focus_ratio is not None:
             focus_quality = max(0.0, min(100.0, (focus_ratio * 0.7) + max(0.0, 30 - (switch_load * 10))))
 
-        interruption_events = sum(1 for _d, _a, _h, _o, _t, _c, reason, *_r in entries if (reason or "").lower().startswith("break"))
+        interruption_events = int(breaks.sum())
         interruption_cost = interruption_events * 10  # minutes lost estimate
 
-        accuracy_by_category = {}
-        for row in entries:
-            activity_name = row[1]
-            hours = row[2]
-            planned = planned_per_day(row)
-            if planned:
-                ratios = accuracy_by_category.setdefault(activity_name, [])
-                ratios.append(hours / planned)
-        category_accuracy = ", ".join(
-            f"{name}: {sum(vals)/len(vals)*100:.0f}%" for name, vals in accuracy_by_category.items()
+        # Report accuracy in the order each activity's first planned entry appears.
+        planned_order = sorted(
+            (row[11], row[0], row[1], ratio_sum / count)
+            for row, ratio_sum, count in zip(activities, ratio_sums, ratio_counts)
+            if count
         )
+        category_accuracy = ", ".join(f"{name}: {ratio * 100:.0f}%" for *_, name, ratio in planned_order)
 
-        drift = sum((daily_hours.get(day, 0.0) - daily_planned.get(day, 0.0)) for day in per_day)
-        drift_text = f"{drift:+.1f}h vs plan"
+        drift = total_actual - total_planned
 
         consistency_score = 0.0
-        if len(daily_hours) > 1:
-            avg_hours = total_actual / len(daily_hours)
-            variance = sum((h - avg_hours) ** 2 for h in daily_hours.values()) / len(daily_hours)
-            consistency_score = max(0.0, min(100.0, 100 - variance * 5))
-        elif daily_hours:
+        if days_count > 1:
+            consistency_score = max(0.0, min(100.0, 100 - float(daily_hours.var()) * 5))
+        elif days_count:
             consistency_score = 100.0
 
         habit_streak = completed_tasks
-        procrastination = sum(1 for row in entries if planned_per_day(row) and row[2] > planned_per_day(row) * 1.3)
+        procrastination = int(over_plan.sum())
 
         flow_efficiency = (focused_time / total_actual * 100) if total_actual else None
 
-        return {
-            "planned_vs_actual": f"{planned_vs_actual:.0f}%" if planned_vs_actual is not None else "N/A",
-            "focus_ratio": f"{focus_ratio:.0f}%" if focus_ratio is not None else "N/A",
-            "category_hours": ", ".join(f"{k}: {v:.1f}h" for k, v in sorted(category_hours.items(), key=lambda i: i[1], reverse=True)),
-            "switches": str(int(switches)),
-            "switch_load": f"{switch_load:.1f}/day",
-            "overtime": f"{overtime:.1f}h",
-            "completion_rate": f"{completion_rate:.0f}%" if completion_rate is not None else "N/A",
-            "avg_task_duration": f"{avg_task_duration:.2f}h" if avg_task_duration is not None else "N/A",
-            "productivity_score": f"{productivity_score:.1f}",
-            "goal_achievement": f"{completion_rate:.0f}%" if completion_rate is not None else "N/A",
-            "efficiency_index": f"{efficiency_index:.2f}x",
-            "task_velocity": f"{velocity:.2f}/day",
-            "capacity_forecast": f"{capacity_forecast:.1f}h next week",
-            "focus_quality": f"{focus_quality:.0f}%",
-            "interruption_cost": f"{interruption_cost:.0f} min",
+        values = {
+            "planned_vs_actual": planned_vs_actual,
+            "focus_ratio": focus_ratio,
+            "category_hours": ", ".join(f"{row[1]}: {row[2]:.1f}h" for row in top_categories),
+            "switches": int(switches),
+            "switch_load": switch_load,
+            "overtime": overtime,
+            "completion_rate": completion_rate,
+            "avg_task_duration": avg_task_duration,
+            "productivity_score": productivity_score,
+            "efficiency_index": efficiency_index,
+            "task_velocity": velocity,
+            "capacity_forecast": capacity_forecast,
+            "focus_quality": focus_quality,
+            "interruption_cost": interruption_cost,
             "category_accuracy": category_accuracy or "No planned targets",
-            "time_drift": drift_text,
-            "consistency_score": f"{consistency_score:.0f}%",
-            "habit_streak": str(habit_streak),
-            "procrastination_flags": str(procrastination),
-            "flow_efficiency": f"{flow_efficiency:.0f}%" if flow_efficiency is not None else "N/A",
+            "time_drift": drift,
+            "consistency_score": consistency_score,
+            "habit_streak": habit_streak,
+            "procrastination_flags": procrastination,
+            "flow_efficiency": flow_efficiency,
         }
+        kpis = {key: _fmt(values[key], spec, suffix) for key, spec, suffix in _KPI_FORMATS}
+        kpis["goal_achievement"] = kpis["completion_rate"]
+        return kpis
 
     # Excel export
     def export_to_excel(self, start_date: date, end_date: date) -> Path:
-        entries = self.storage.get_entries_between(start_date, end_date)
-        stats = self.storage.get_statistics_by_activity(start_date, end_date)
+        entries, stats = self.storage.report_bundle(start_date, end_date)
         stat_rows = [
             (s.activity_name, s.total_hours, s.avg_hours, s.avg_completion)
             for s in stats
         ]
         return self.exporter.export(entries, stat_rows)
 
+    def export_to_excel_async(self, start_date: date, end_date: date) -> "Future[Path]":
+        """Query before returning, then hand serialization to the exporter's worker."""
+        entries, stats = self.storage.report_bundle(start_date, end_date)
+        stat_rows = [
+            (s.activity_name, s.total_hours, s.avg_hours, s.avg_completion)
+            for s in stats
+        ]
+        return self.exporter.export_async(entries, stat_rows)
+
+    def _schedule_config_save(self) -> None:
+        """Write the config once changes stop arriving for CONFIG_SAVE_DELAY seconds."""
+
+        with self._config_save_lock:
+            if self._config_save_timer is not None:
+                self._config_save_timer.cancel()
+            self._config_save_timer = threading.Timer(CONFIG_SAVE_DELAY, self.flush_config)
+            self._config_save_timer.daemon = True
+            self._config_save_timer.start()
+
+    def flush_config(self) -> None:
+        """Write the config now, dropping any pending delayed save."""
+
+        with self._config_save_lock:
+            if self._config_save_timer is not None:
+                self._config_save_timer.cancel()
+                self._config_save_timer = None
+        self.config_manager.save()
+
     def save_config(self, last_activity: Optional[int], layout: Optional[str] = None) -> None:
         cfg = self.config_manager.config
         cfg.last_selected_activity = last_activity
         if layout is not None:
             cfg.last_layout = layout
-        self.config_manager.save(cfg)
+        self.flush_config()
 
     def backup_database(self) -> Path:
         return self.storage.backup_database()
@@ -536,17 +649,41 @@ class AppController:
         return self.storage.export_tasks(path)
 
     def import_tasks(self, path: Path) -> int:
-        return self.storage.import_tasks(path)
+        imported = self.storage.import_tasks(path)
+        self._activities_rev += 1
+        return imported
+
+    @property
+    def today(self) -> date:
+        """Current date; rolls over at midnight within ``TODAY_RECHECK_SECONDS``."""
+
+        self.refresh_today()
+        return self._today
 
     def refresh_today(self) -> None:
-        self.today = date.today()
+        now = time.monotonic()
+        if now - self._today_checked < TODAY_RECHECK_SECONDS:
+            return
+        self._today_checked = now
+        self._today = date.today()
 
     # Productivity AI bridge
     def predict_productivity(self, user_id: str, date_or_range) -> float:
+        from src.ai_integration import productivity_adapter
+
         return productivity_adapter.predict_productivity(user_id, date_or_range, storage=self.storage)
 
+    def predict_productivity_bulk(self, user_id: str, dates: list[date]) -> np.ndarray:
+        from src.ai_integration import productivity_adapter
+
+        return productivity_adapter.predict_productivity_bulk(user_id, dates, storage=self.storage)
+
     def productivity_insights(self, user_id: str, date_range) -> list[str]:
+        from src.ai_integration import productivity_adapter
+
         return productivity_adapter.get_productivity_insights(user_id, date_range, storage=self.storage)
 
     def train_productivity_model(self, user_id: str = "default"):
+        from src.ai_integration import productivity_adapter
+
         return productivity_adapter.train_productivity_model(user_id=user_id, storage=self.storage)
@@ -1,12 +1,21 @@
 """Data models for the study tracker application."""
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
 from datetime import date
+from functools import lru_cache
 from typing import Optional
 
 
-@dataclass
+@lru_cache(maxsize=4096)
+def _parse_iso(value: str) -> date:
+    """Parse an ISO date; entries loaded together share a handful of dates."""
+
+    return date.fromisoformat(value)
+
+
+@dataclass(slots=True)
 class Activity:
     """Represents a tracked activity."""
 
@@ -37,7 +46,8 @@ class Activity:
             is_active = bool(row[6])
         return cls(
             id=row[0],
-            name=row[1],
+            # Activity lists are reloaded often; share one string per name.
+            name=sys.intern(row[1]),
             description=description,
             default_target_hours=default_target,
             tags=tags,
@@ -46,7 +56,7 @@ class Activity:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class DailyEntry:
     """Represents the aggregate entry per activity per date."""
 
@@ -64,7 +74,7 @@ class DailyEntry:
 
     @classmethod
     def from_row(cls, row: tuple) -> "DailyEntry":
-        parsed_date = date.fromisoformat(row[1])
+        parsed_date = _parse_iso(row[1])
         objectives = row[4] or ""
         target_hours = row[5] if len(row) > 5 and row[5] is not None else 0.0
         completion_percent = row[6] if len(row) > 6 and row[6] is not None else 0.0
@@ -87,7 +97,7 @@ class DailyEntry:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ActivityStats:
     """Aggregated statistics per activity for the selected range."""
 
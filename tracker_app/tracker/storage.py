@@ -4,9 +4,10 @@ from __future__ import annotations
 import csv
 import json
 import logging
-import shutil
 import sqlite3
-from contextlib import contextmanager
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
 from datetime import date, datetime
 from pathlib import Path
 from typing import Iterable, List, Optional, Tuple
@@ -15,6 +16,98 @@ from .models import Activity, ActivityStats, DailyEntry
 
 LOGGER = logging.getLogger(__name__)
 
+# Seconds a connection waits on a locked database before raising.
+BUSY_TIMEOUT = 30.0
+# Worker threads that run report queries alongside the caller; WAL lets them
+# read concurrently, and a small pool keeps lock contention low.
+READ_WORKERS = 2
+# Per-connection tuning: WAL only needs a full fsync at checkpoints, sorts and
+# temp tables stay in RAM, and the page cache holds ~20 MB (negative = KiB).
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+)
+
+# Entries in the bound date range with each row's planned hours: its target,
+# else its share of a multi-day plan. Entries whose activity is gone are left
+# out here so the per-day and per-activity sums always cover the same rows.
+_KPI_ROWS = """
+    WITH kpi_rows AS (
+        SELECT de.date, de.activity_id, a.name, de.duration_hours AS hours, de.completion_percent AS completion,
+               de.stop_reason,
+               CASE WHEN de.target_hours != 0 THEN de.target_hours
+                    ELSE de.plan_total_hours / COALESCE(NULLIF(de.plan_days, 0), 1) END AS planned
+        FROM daily_entries de
+        JOIN activities a ON a.id = de.activity_id
+        WHERE de.date BETWEEN ? AND ?
+    )
+"""
+# Per-activity and per-day KPI sums over kpi_rows; see Storage.get_kpi_aggregates.
+_KPI_ACTIVITIES_SQL = _KPI_ROWS + """
+    SELECT r.activity_id, r.name, TOTAL(r.hours), TOTAL(r.hours * r.completion / 100.0), COUNT(*),
+           COUNT(CASE WHEN r.completion >= 100 THEN 1 END),
+           COUNT(CASE WHEN r.stop_reason LIKE 'break%' THEN 1 END),
+           TOTAL(r.planned),
+           TOTAL(CASE WHEN r.planned != 0 THEN r.hours / r.planned END),
+           COUNT(CASE WHEN r.planned != 0 THEN 1 END),
+           COUNT(CASE WHEN r.planned != 0 AND r.hours > r.planned * 1.3 THEN 1 END),
+           MIN(CASE WHEN r.planned != 0 THEN r.date END)
+    FROM kpi_rows r
+    GROUP BY r.activity_id
+    ORDER BY MIN(r.date), r.activity_id
+"""
+_KPI_DAYS_SQL = _KPI_ROWS + """
+    SELECT date, TOTAL(hours), COUNT(*)
+    FROM kpi_rows
+    GROUP BY date
+    ORDER BY date
+"""
+
+# Keys of the per-entry dicts returned by get_time_history, in SELECT order.
+_HISTORY_KEYS = ("title", "actual_duration", "estimated_duration", "completion_percent")
+
+# Columns added after the first release, as (table, column, DDL); existing
+# databases gain any that are missing when the storage is opened.
+_MIGRATION_COLUMNS = (
+    ("daily_entries", "target_hours", "REAL NOT NULL DEFAULT 0"),
+    ("daily_entries", "completion_percent", "REAL NOT NULL DEFAULT 0"),
+    ("daily_entries", "stop_reason", "TEXT"),
+    ("daily_entries", "comments", "TEXT"),
+    ("daily_entries", "plan_total_hours", "REAL NOT NULL DEFAULT 0"),
+    ("daily_entries", "plan_days", "INTEGER NOT NULL DEFAULT 1"),
+    ("activities", "description", "TEXT"),
+    ("activities", "default_target_hours", "REAL NOT NULL DEFAULT 0"),
+    ("activities", "tags", "TEXT"),
+    ("activities", "priority", "TEXT NOT NULL DEFAULT 'Medium'"),
+)
+
+# One-statement upsert for a (date, activity) entry; see upsert_daily_entry.
+_UPSERT_ENTRY_SQL = """
+    INSERT INTO daily_entries (date, activity_id, duration_hours, objectives_succeeded, target_hours, completion_percent, stop_reason, comments, plan_total_hours, plan_days)
+    VALUES (
+        :date, :activity_id, :delta, COALESCE(:objectives, ''), COALESCE(:target, 0), COALESCE(:percent, 0),
+        COALESCE(:reason, ''), COALESCE(:comments, ''), COALESCE(:plan_total, :target, 0), COALESCE(NULLIF(:plan_days, 0), 1)
+    )
+    ON CONFLICT(date, activity_id) DO UPDATE SET
+        duration_hours = duration_hours + :delta,
+        objectives_succeeded = COALESCE(:objectives, objectives_succeeded),
+        target_hours = CASE WHEN :plan_total IS NULL AND :target IS NOT NULL THEN target_hours + :target
+                            ELSE COALESCE(:target, target_hours) END,
+        completion_percent = COALESCE(:percent, completion_percent),
+        stop_reason = COALESCE(:reason, stop_reason),
+        comments = COALESCE(:comments, comments),
+        plan_total_hours = COALESCE(:plan_total, plan_total_hours),
+        plan_days = COALESCE(:plan_days, plan_days)
+"""
+_UPSERT_ENTRY_RETURNING_SQL = _UPSERT_ENTRY_SQL + (
+    "RETURNING id, date, activity_id, duration_hours, objectives_succeeded, target_hours,"
+    " completion_percent, stop_reason, comments, plan_total_hours, plan_days"
+)
+# Named parameters of _UPSERT_ENTRY_SQL, in upsert_daily_entry's argument order, with their defaults.
+_UPSERT_ENTRY_FIELDS = ("date", "activity_id", "delta", "objectives", "target", "percent", "reason", "comments", "plan_total", "plan_days")
+_UPSERT_ENTRY_DEFAULTS = (None, None, 0.0, None, None, None, None, None, None, None)
+
 
 class Storage:
     """Wrapper around SQLite to manage activities and daily entries."""
@@ -22,11 +115,48 @@ class Storage:
     def __init__(self, db_path: Path) -> None:
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Bumped after every committed write so callers can cache query results.
+        self.version = 0
+        # One long-lived connection per thread; all are tracked so close() can release them.
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._read_pool: Optional[ThreadPoolExecutor] = None
         self._init_db()
+        self._enable_wal()
+
+    def _enable_wal(self) -> None:
+        """Switch the database file to WAL so readers never wait on the writer.
+
+        The journal mode is stored in the file, so this runs once per Storage.
+        """
+
+        if str(self.db_path) == ":memory:":
+            return
+        with self._get_conn() as conn:
+            mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        if mode.lower() != "wal":
+            LOGGER.warning("SQLite kept journal mode %s for %s", mode, self.db_path)
+
+    def _thread_conn(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening and tuning it on first use."""
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Default row/text factories on purpose: plain tuples and the built-in
+            # UTF-8 decode are the cheapest rows sqlite3 can hand back.
+            conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+            for pragma in _CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
 
     @contextmanager
     def _get_conn(self) -> Iterable[sqlite3.Connection]:
-        conn = sqlite3.connect(self.db_path)
+        conn = self._thread_conn()
+        changes = conn.total_changes
         try:
             yield conn
             conn.commit()
@@ -34,8 +164,26 @@ class Storage:
             conn.rollback()
             LOGGER.exception("Database operation failed")
             raise
-        finally:
+        if conn.total_changes != changes:
+            self.version += 1
+
+    def close(self) -> None:
+        """Close every connection this Storage opened; later calls reconnect."""
+
+        if self._read_pool is not None:
+            self._read_pool.shutdown(wait=True)
+            self._read_pool = None
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            # Lets SQLite refresh planner statistics for tables that need it.
+            conn.execute("PRAGMA optimize")
             conn.close()
+        self._local = threading.local()
+
+    def connection(self):
+        """Context-managed connection for bulk readers such as ``pandas.read_sql_query``."""
+        return self._get_conn()
 
     def _init_db(self) -> None:
         with self._get_conn() as conn:
@@ -72,39 +220,30 @@ class Storage:
                 )
                 """
             )
+            # UNIQUE(date, activity_id) already serves date lookups and ranges;
+            # this one serves per-activity totals and deletes.
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_daily_activity_date ON daily_entries(activity_id, date)")
         self._ensure_columns()
 
     def _ensure_columns(self) -> None:
         """Add newly introduced columns for existing installations."""
 
-        def _add_column(name: str, ddl: str, table: str = "daily_entries") -> None:
-            with self._get_conn() as conn:
-                cur = conn.cursor()
-                cur.execute(f"PRAGMA table_info({table})")
-                cols = [row[1] for row in cur.fetchall()]
-                if name not in cols:
-                    cur.execute(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}")
+        with self._get_conn() as conn:
+            existing = {}
+            for table, name, ddl in _MIGRATION_COLUMNS:
+                if table not in existing:
+                    existing[table] = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+                if name not in existing[table]:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}")
                     LOGGER.info("Added column %s to %s", name, table)
 
-        _add_column("target_hours", "REAL NOT NULL DEFAULT 0")
-        _add_column("completion_percent", "REAL NOT NULL DEFAULT 0")
-        _add_column("stop_reason", "TEXT")
-        _add_column("comments", "TEXT")
-        _add_column("plan_total_hours", "REAL NOT NULL DEFAULT 0")
-        _add_column("plan_days", "INTEGER NOT NULL DEFAULT 1")
-        _add_column("description", "TEXT", table="activities")
-        _add_column("default_target_hours", "REAL NOT NULL DEFAULT 0", table="activities")
-        _add_column("tags", "TEXT", table="activities")
-        _add_column("priority", "TEXT NOT NULL DEFAULT 'Medium'", table="activities")
-
     def get_activities(self) -> List[Activity]:
         with self._get_conn() as conn:
             cur = conn.cursor()
             cur.execute(
                 "SELECT id, name, description, default_target_hours, tags, priority, is_active FROM activities ORDER BY name ASC"
             )
-            rows = cur.fetchall()
-            return [Activity.from_row(row) for row in rows]
+            return [Activity.from_row(row) for row in cur]
 
     def create_activity(
         self,
@@ -170,6 +309,11 @@ class Storage:
             LOGGER.info("Updated activity %s", activity_id)
 
     def delete_activity(self, activity_id: int) -> None:
+        """Delete an activity and its entries in one transaction.
+
+        Foreign keys are not enforced (legacy databases declare no cascade), so
+        the entries are removed explicitly; the activity index makes that a seek.
+        """
         with self._get_conn() as conn:
             cur = conn.cursor()
             cur.execute("DELETE FROM activities WHERE id = ?", (activity_id,))
@@ -212,78 +356,43 @@ class Storage:
         plan_total_hours: Optional[float] = None,
         plan_days: Optional[int] = None,
     ) -> DailyEntry:
-        """Add or update the daily entry for the activity and date."""
+        """Add or update the daily entry for the activity and date.
+
+        Unset (``None``) fields keep their stored value. ``target_hours`` adds to
+        the stored target unless a plan total is given with it.
+        """
+        params = {
+            "date": entry_date.isoformat(),
+            "activity_id": activity_id,
+            "delta": duration_hours_delta,
+            "objectives": objectives_text,
+            "target": target_hours,
+            "percent": completion_percent,
+            "reason": stop_reason,
+            "comments": comments,
+            "plan_total": plan_total_hours,
+            "plan_days": plan_days,
+        }
         with self._get_conn() as conn:
-            cur = conn.cursor()
-            existing = self.get_daily_entry(entry_date, activity_id)
-            if existing:
-                new_duration = existing.duration_hours + duration_hours_delta
-                new_objectives = objectives_text if objectives_text is not None else existing.objectives_succeeded
-                if plan_total_hours is None and target_hours is not None:
-                    new_target = (existing.target_hours or 0.0) + target_hours
-                else:
-                    new_target = target_hours if target_hours is not None else existing.target_hours
-                new_percent = completion_percent if completion_percent is not None else existing.completion_percent
-                new_reason = stop_reason if stop_reason is not None else existing.stop_reason
-                new_comments = comments if comments is not None else getattr(existing, "comments", "")
-                fallback_plan = target_hours if target_hours is not None else getattr(existing, "target_hours", 0.0)
-                new_plan_total = plan_total_hours if plan_total_hours is not None else getattr(existing, "plan_total_hours", fallback_plan)
-                new_plan_days = plan_days if plan_days is not None else getattr(existing, "plan_days", 1)
-                cur.execute(
-                    """
-                    UPDATE daily_entries
-                    SET duration_hours = ?, objectives_succeeded = ?, target_hours = ?, completion_percent = ?, stop_reason = ?, comments = ?, plan_total_hours = ?, plan_days = ?
-                    WHERE id = ?
-                    """,
-                    (new_duration, new_objectives, new_target, new_percent, new_reason, new_comments, new_plan_total, new_plan_days, existing.id),
-                )
-                LOGGER.debug("Updated entry for %s %s", entry_date, activity_id)
-                return DailyEntry(
-                    id=existing.id,
-                    date=entry_date,
-                    activity_id=activity_id,
-                    duration_hours=new_duration,
-                    objectives_succeeded=new_objectives,
-                    target_hours=new_target,
-                    completion_percent=new_percent,
-                    stop_reason=new_reason,
-                    comments=new_comments,
-                    plan_total_hours=new_plan_total,
-                    plan_days=new_plan_days,
-                )
-            cur.execute(
-                """
-                INSERT INTO daily_entries (date, activity_id, duration_hours, objectives_succeeded, target_hours, completion_percent, stop_reason, comments, plan_total_hours, plan_days)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    entry_date.isoformat(),
-                    activity_id,
-                    duration_hours_delta,
-                    objectives_text or "",
-                    target_hours or 0.0,
-                    completion_percent or 0.0,
-                    stop_reason or "",
-                    comments or "",
-                    plan_total_hours if plan_total_hours is not None else (target_hours or 0.0),
-                    plan_days or 1,
-                ),
-            )
-            entry_id = cur.lastrowid
-            LOGGER.debug("Created entry for %s %s", entry_date, activity_id)
-            return DailyEntry(
-                id=entry_id,
-                date=entry_date,
-                activity_id=activity_id,
-                duration_hours=duration_hours_delta,
-                objectives_succeeded=objectives_text or "",
-                target_hours=target_hours or 0.0,
-                completion_percent=completion_percent or 0.0,
-                stop_reason=stop_reason or "",
-                comments=comments or "",
-                plan_total_hours=plan_total_hours or 0.0,
-                plan_days=plan_days or 1,
-            )
+            row = conn.execute(_UPSERT_ENTRY_RETURNING_SQL, params).fetchone()
+        LOGGER.debug("Upserted entry for %s %s", entry_date, activity_id)
+        return DailyEntry.from_row(row)
+
+    def upsert_daily_entries_bulk(self, rows: Iterable[tuple]) -> int:
+        """Upsert many daily entries in one transaction and return how many were applied.
+
+        Each row holds ``upsert_daily_entry``'s positional arguments, starting with
+        ``(entry_date, activity_id)``; omitted trailing fields use the same defaults.
+        """
+
+        params = [
+            dict(zip(_UPSERT_ENTRY_FIELDS, (row[0].isoformat(), *row[1:], *_UPSERT_ENTRY_DEFAULTS[len(row):])))
+            for row in rows
+        ]
+        with self._get_conn() as conn:
+            conn.executemany(_UPSERT_ENTRY_SQL, params)
+        LOGGER.info("Upserted %s entries", len(params))
+        return len(params)
 
     def get_daily_entries_by_date(self, entry_date: date) -> List[DailyEntry]:
         with self._get_conn() as conn:
@@ -295,7 +404,7 @@ class Storage:
                 """,
                 (entry_date.isoformat(),),
             )
-            return [DailyEntry.from_row(row) for row in cur.fetchall()]
+            return [DailyEntry.from_row(row) for row in cur]
 
     def get_entries_between(self, start_date: date, end_date: date) -> List[Tuple[str, str, float, str, float, float, str, str, float, int]]:
         with self._get_conn() as conn:
@@ -312,6 +421,44 @@ class Storage:
             )
             return cur.fetchall()
 
+    def get_kpi_aggregates(self, start_date: date, end_date: date) -> Tuple[List[tuple], List[tuple]]:
+        """Return per-day and per-activity KPI sums for the range, aggregated in SQLite.
+
+        Day rows are ``(date, hours, activities)`` in date order; UNIQUE(date,
+        activity_id) makes a plain row count the number of distinct activities. Activity rows are
+        ``(activity_id, name, hours, focused_hours, entries, completed, breaks,
+        planned_hours, accuracy_sum, accuracy_count, over_plan, first_planned_date)``
+        in first-seen order. ``breaks`` counts stop reasons starting with "break" in
+        any case; LIKE already folds ASCII case, so no lowered copy is built.
+        """
+
+        with self._get_conn() as conn:
+            cur = conn.cursor()
+            params = (start_date.isoformat(), end_date.isoformat())
+            cur.execute(_KPI_ACTIVITIES_SQL, params)
+            activities = cur.fetchall()
+            if start_date == end_date:
+                # A single day (the usual "today" view) is just the activity totals.
+                hours = sum(row[2] for row in activities)
+                return ([(params[0], hours, len(activities))] if activities else []), activities
+            cur.execute(_KPI_DAYS_SQL, params)
+            return cur.fetchall(), activities
+
+    def report_bundle(
+        self, start_date: date, end_date: date
+    ) -> Tuple[List[Tuple[str, str, float, str, float, float, str, str, float, int]], List[ActivityStats]]:
+        """Return ``(get_entries_between, get_statistics_by_activity)`` for one range.
+
+        The statistics run on a pool thread with its own connection while this
+        thread reads the entries, so the two scans overlap.
+        """
+
+        if self._read_pool is None:
+            self._read_pool = ThreadPoolExecutor(max_workers=READ_WORKERS, thread_name_prefix="storage-read")
+        stats = self._read_pool.submit(self.get_statistics_by_activity, start_date, end_date)
+        entries = self.get_entries_between(start_date, end_date)
+        return entries, stats.result()
+
     def get_total_hours_for_activity(self, activity_id: int) -> float:
         """Return cumulative duration for an activity across all time."""
         with self._get_conn() as conn:
@@ -339,7 +486,6 @@ class Storage:
                 """,
                 (start_date.isoformat(), end_date.isoformat()),
             )
-            rows = cur.fetchall()
             return [
                 ActivityStats(
                     activity_name=row[0],
@@ -347,81 +493,72 @@ class Storage:
                     avg_hours=row[2] or 0.0,
                     avg_completion=row[3] or 0.0,
                 )
-                for row in rows
+                for row in cur
             ]
 
     def get_time_history(self) -> List[dict]:
         """Return simplified rows for AI analysis without UI dependencies."""
 
         with self._get_conn() as conn:
-            cur = conn.cursor()
-            cur.execute(
+            cur = conn.execute(
                 """
-                SELECT a.name, de.duration_hours, de.target_hours, de.completion_percent
+                SELECT a.name, COALESCE(de.duration_hours, 0.0), COALESCE(de.target_hours, 0.0),
+                       COALESCE(de.completion_percent, 0.0)
                 FROM daily_entries de
                 JOIN activities a ON de.activity_id = a.id
                 """
             )
-            return [
-                {
-                    "title": row[0],
-                    "actual_duration": row[1] or 0.0,
-                    "estimated_duration": row[2] or 0.0,
-                    "completion_percent": row[3] or 0.0,
-                }
-                for row in cur.fetchall()
-            ]
+            return [dict(zip(_HISTORY_KEYS, row)) for row in cur]
 
     def backup_database(self) -> Path:
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
         target = self.db_path.with_name(f"{self.db_path.stem}-backup-{timestamp}{self.db_path.suffix}")
-        shutil.copy2(self.db_path, target)
+        # The online backup API copies a consistent snapshot, WAL contents included.
+        with self._get_conn() as conn, closing(sqlite3.connect(target)) as copy:
+            conn.backup(copy)
         LOGGER.info("Database backed up to %s", target)
         return target
 
     def export_tasks(self, path: Path) -> Path:
-        activities = self.get_activities()
-        with path.open("w", newline="", encoding="utf-8") as fh:
-            writer = csv.DictWriter(
-                fh, fieldnames=["name", "description", "default_target_hours", "tags", "is_active"]
-            )
-            writer.writeheader()
-            for act in activities:
-                writer.writerow(
-                    {
-                        "name": act.name,
-                        "description": act.description,
-                        "default_target_hours": act.default_target_hours,
-                        "tags": act.tags,
-                        "is_active": int(act.is_active),
-                    }
+        with self._get_conn() as conn, path.open("w", newline="", encoding="utf-8") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(["name", "description", "default_target_hours", "tags", "is_active"])
+            # Rows go from the cursor to the file without building Activity objects.
+            writer.writerows(
+                conn.execute(
+                    "SELECT name, description, COALESCE(default_target_hours, 0.0), tags, "
+                    "CASE WHEN is_active THEN 1 ELSE 0 END FROM activities ORDER BY name ASC"
                 )
-        LOGGER.info("Exported %s activities to %s", len(activities), path)
+            )
+        LOGGER.info("Exported activities to %s", path)
         return path
 
     def import_tasks(self, path: Path) -> int:
         path = Path(path)
         if not path.exists():
             raise FileNotFoundError(path)
-        imported = 0
         if path.suffix.lower() == ".json":
             data = json.loads(path.read_text(encoding="utf-8"))
-            rows = data if isinstance(data, list) else data.get("tasks", [])
+            imported = self._insert_tasks(data if isinstance(data, list) else data.get("tasks", []))
         else:
             with path.open("r", newline="", encoding="utf-8") as fh:
-                reader = csv.DictReader(fh)
-                rows = list(reader)
-        for row in rows:
-            name = row.get("name") if isinstance(row, dict) else None
-            if not name:
-                continue
-            description = row.get("description", "") if isinstance(row, dict) else ""
-            target = float(row.get("default_target_hours", 0) or 0)
-            tags = row.get("tags", "") if isinstance(row, dict) else ""
-            try:
-                self.create_activity(name, description=description, default_target_hours=target, tags=tags)
-                imported += 1
-            except sqlite3.IntegrityError:
-                LOGGER.info("Skipped duplicate task %s during import", name)
+                # executemany pulls rows straight from the reader; the file is never listed.
+                imported = self._insert_tasks(csv.DictReader(fh))
         LOGGER.info("Imported %s tasks from %s", imported, path)
         return imported
+
+    def _insert_tasks(self, rows: Iterable[dict]) -> int:
+        records = (
+            (row["name"], row.get("description", ""), float(row.get("default_target_hours", 0) or 0), row.get("tags", ""))
+            for row in rows
+            if isinstance(row, dict) and row.get("name")
+        )
+        with self._get_conn() as conn:
+            changes = conn.total_changes
+            # Names already stored (or repeated in the file) are skipped, not errors.
+            conn.executemany(
+                "INSERT INTO activities (name, description, default_target_hours, tags, priority, is_active) "
+                "VALUES (?, ?, ?, ?, 'Medium', 1) ON CONFLICT(name) DO NOTHING",
+                records,
+            )
+            return conn.total_changes - changes
@@ -9,6 +9,7 @@ from datetime import timedelta
 from typing import Callable, Dict, Optional
 
 LOGGER = logging.getLogger(__name__)
+TICK_SECONDS = 1.0
 
 
 @dataclass
@@ -64,10 +65,18 @@ class TimerManager:
             self.timers[activity_id] = TimerState()
         return self.timers[activity_id]
 
+    @staticmethod
+    def _next_wait(timer: TimerState) -> float:
+        """Sleep one tick, or less when the target would be reached sooner."""
+        if timer.is_running and timer.target_seconds > 0 and not timer.completion_fired:
+            remaining = timer.target_seconds - timer.current_elapsed()
+            return max(0.0, min(TICK_SECONDS, remaining))
+        return TICK_SECONDS
+
     def _run_loop(self, activity_id: int) -> None:
         timer = self.ensure_timer(activity_id)
         assert timer.stop_event is not None
-        while not timer.stop_event.wait(1):
+        while not timer.stop_event.wait(self._next_wait(timer)):
             if timer.is_running and timer.on_tick:
                 try:
                     timer.on_tick(timer.current_elapsed())
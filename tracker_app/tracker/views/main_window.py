@@ -6,6 +6,7 @@ import logging
 import os
 import random
 import tempfile
+from collections import Counter, defaultdict
 from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Dict, Optional
@@ -56,6 +57,30 @@ MOTIVATION = [
 ]
 
 
+def _show_export_error(exc: Exception) -> None:
+    wx.MessageBox(
+        f"Excel export failed.\n\n{exc}\nClose any open Excel file and verify write access.",
+        "Export error",
+        style=wx.ICON_ERROR,
+    )
+
+
+def _export_in_background(controller: AppController, start: date, end: date, title: str = "Export complete") -> None:
+    """Start an Excel export in the worker process and report back on the UI thread."""
+
+    def _report(future) -> None:
+        try:
+            path = future.result()
+        except Exception as exc:  # pragma: no cover - UI path
+            LOGGER.exception("Excel export failed")
+            _show_export_error(exc)
+            return
+        wx.MessageBox(f"Exported statistics to {path}", title)
+
+    future = controller.export_to_excel_async(start, end)
+    future.add_done_callback(lambda done: wx.CallAfter(_report, done))
+
+
 class HistoryPanel(wx.Panel):
     """Tab for viewing historic entries."""
 
@@ -305,15 +330,10 @@ class StatsPanel(wx.Panel):
     def _on_export(self, event: wx.Event) -> None:
         try:
             start, end = self._date_range()
-            path = self.controller.export_to_excel(start, end)
-            wx.MessageBox(f"Exported statistics to {path}", "Export complete")
+            _export_in_background(self.controller, start, end)
         except Exception as exc:  # pragma: no cover - UI path
             LOGGER.exception("Statistics export failed")
-            wx.MessageBox(
-                f"Excel export failed.\n\n{exc}\nClose any open Excel file and verify write access.",
-                "Export error",
-                style=wx.ICON_ERROR,
-            )
+            _show_export_error(exc)
 
 
 class StatsChartsPanel(wx.ScrolledWindow):
@@ -386,11 +406,11 @@ class StatsChartsPanel(wx.ScrolledWindow):
             self.chart_hours.SetBitmap(self._to_bitmap(fig1))
 
             # Planned vs actual per day
-            per_day_actual: Dict[str, float] = {}
-            per_day_planned: Dict[str, float] = {}
+            per_day_actual: Dict[str, float] = defaultdict(float)
+            per_day_planned: Dict[str, float] = defaultdict(float)
             for entry_date, _activity, hours, _obj, target, *_rest in entries:
-                per_day_actual[entry_date] = per_day_actual.get(entry_date, 0.0) + (hours or 0.0)
-                per_day_planned[entry_date] = per_day_planned.get(entry_date, 0.0) + (target or 0.0)
+                per_day_actual[entry_date] += hours or 0.0
+                per_day_planned[entry_date] += target or 0.0
             days_sorted = sorted(per_day_actual.keys())
             if days_sorted:
                 fig2, ax2 = plt.subplots(figsize=(5, 3))
@@ -411,12 +431,10 @@ class StatsChartsPanel(wx.ScrolledWindow):
                 self.chart_planned.SetBitmap(wx.NullBitmap)
 
             # Focus trend line
-            focus_by_day: Dict[str, float] = {}
+            focus_by_day: Dict[str, float] = defaultdict(float)
             for entry_date, _activity, hours, _obj, _target, completion, *_rest in entries:
                 if hours:
-                    focus = hours * ((completion or 0.0) / 100)
-                    focus_by_day.setdefault(entry_date, 0.0)
-                    focus_by_day[entry_date] += focus
+                    focus_by_day[entry_date] += hours * ((completion or 0.0) / 100)
             focus_days = sorted(focus_by_day.keys())
             fig3, ax3 = plt.subplots(figsize=(5, 3))
             ratios = []
@@ -431,9 +449,9 @@ class StatsChartsPanel(wx.ScrolledWindow):
             self.chart_focus.SetBitmap(self._to_bitmap(fig3))
 
             # Category distribution
-            category_hours: Dict[str, float] = {}
+            category_hours: Dict[str, float] = defaultdict(float)
             for _date, activity_name, hours, *_rest in entries:
-                category_hours[activity_name] = category_hours.get(activity_name, 0.0) + (hours or 0.0)
+                category_hours[activity_name] += hours or 0.0
             labels = list(category_hours.keys())
             values = list(category_hours.values())
             if labels and any(values):
@@ -462,11 +480,9 @@ class StatsChartsPanel(wx.ScrolledWindow):
             self.chart_on_time.SetBitmap(self._to_bitmap(fig6))
 
             # Productivity score trend
-            score_by_day: Dict[str, float] = {}
+            score_by_day: Dict[str, float] = defaultdict(float)
             for entry_date, _a, hours, _o, _t, completion, *_r in entries:
-                focused = hours * ((completion or 0.0) / 100) if hours else 0.0
-                score_by_day.setdefault(entry_date, 0.0)
-                score_by_day[entry_date] += focused
+                score_by_day[entry_date] += hours * ((completion or 0.0) / 100) if hours else 0.0
             score_days = sorted(score_by_day.keys())
             fig7, ax7 = plt.subplots(figsize=(5, 3))
             ax7.plot(score_days, [score_by_day[d] for d in score_days], marker="o", color=PRIMARY)
@@ -478,10 +494,9 @@ class StatsChartsPanel(wx.ScrolledWindow):
             # Backlog evolution (cumulative remaining)
             backlog = []
             cumulative = 0
+            open_by_day = Counter(d for d, _a, _h, _o, _t, c, *_r in entries if (c or 0) < 100)
             for day in score_days:
-                daily_total = sum(1 for d, *_r in entries if d == day)
-                daily_done = sum(1 for d, _a, _h, _o, _t, c, *_r in entries if d == day and (c or 0) >= 100)
-                cumulative += max(daily_total - daily_done, 0)
+                cumulative += open_by_day[day]
                 backlog.append((day, cumulative))
             fig8, ax8 = plt.subplots(figsize=(5, 3))
             if backlog:
@@ -492,9 +507,9 @@ class StatsChartsPanel(wx.ScrolledWindow):
             self.chart_backlog.SetBitmap(self._to_bitmap(fig8))
 
             # Average duration by activity
-            durations: Dict[str, list] = {}
+            durations: Dict[str, list] = defaultdict(list)
             for _date, activity_name, hours, *_r in entries:
-                durations.setdefault(activity_name, []).append(hours or 0.0)
+                durations[activity_name].append(hours or 0.0)
             fig9, ax9 = plt.subplots(figsize=(5, 3))
             labels = list(durations.keys())
             values = [sum(v) / len(v) if v else 0.0 for v in durations.values()]
@@ -593,15 +608,10 @@ class StatsChartsPanel(wx.ScrolledWindow):
     def on_export(self, event: wx.Event) -> None:
         try:
             start, end = self._date_range()
-            path = self.controller.export_to_excel(start, end)
-            wx.MessageBox(f"Exported statistics to {path}", "Export complete")
+            _export_in_background(self.controller, start, end)
         except Exception as exc:  # pragma: no cover - UI path
             LOGGER.exception("Export failed")
-            wx.MessageBox(
-                f"Excel export failed.\n\n{exc}\nClose any open Excel file and verify write access.",
-                "Export error",
-                style=wx.ICON_ERROR,
-            )
+            _show_export_error(exc)
 
     def _build_ui(self) -> None:
         self.SetBackgroundColour(SURFACE)
@@ -1160,7 +1170,7 @@ class MainPanel(wx.ScrolledWindow):
         ai_btn.SetBackgroundColour(ACCENT)
         ai_btn.SetForegroundColour("#0b1220")
         ai_btn.Bind(wx.EVT_BUTTON, self._handle_ai_assist)
-        ai_btn.SetToolTip("Use TensorFlow helpers to suggest duration, priority, and a daily plan")
+        ai_btn.SetToolTip("Use AI helpers to suggest duration, priority, and a daily plan")
         show_btn = wx.Button(header, label="Show windows")
         show_btn.SetBackgroundColour(SECONDARY)
         show_btn.SetForegroundColour("white")
@@ -1704,15 +1714,10 @@ class MainPanel(wx.ScrolledWindow):
 
     def _export_range(self, start: date, end: date, title: str) -> None:
         try:
-            path = self.controller.export_to_excel(start, end)
-            wx.MessageBox(f"Exported statistics to {path}", title)
+            _export_in_background(self.controller, start, end, title)
         except Exception as exc:  # pragma: no cover - UI path
             LOGGER.exception("Export failed")
-            wx.MessageBox(
-                f"Excel export failed.\n\n{exc}\nClose any open Excel file and verify write access.",
-                "Export error",
-                style=wx.ICON_ERROR,
-            )
+            _show_export_error(exc)
 
     def _show_daily_summary(self, event: wx.CommandEvent) -> None:
         activities = {a.id: a.name for a in self.controller.list_activities()}
@@ -1732,13 +1737,11 @@ class MainPanel(wx.ScrolledWindow):
         if not entries:
             wx.MessageBox("No data for the last week yet.", "Weekly overview")
             return
-        by_day: Dict[date, float] = {}
-        for entry in entries:
-            entry_date = date.fromisoformat(entry[0]) if isinstance(entry[0], str) else entry[0]
-            hours = entry[2] if len(entry) > 2 else 0.0
-            by_day.setdefault(entry_date, 0.0)
+        # Rows arrive date-ordered with ISO date strings, so they group as-is.
+        by_day: Dict[str, float] = defaultdict(float)
+        for entry_date, _name, hours, *_rest in entries:
             by_day[entry_date] += hours or 0.0
-        lines = [f"{d.isoformat()}: {hours:.2f}h" for d, hours in sorted(by_day.items())]
+        lines = [f"{day}: {hours:.2f}h" for day, hours in by_day.items()]
         wx.MessageBox("\n".join(lines), "Weekly overview")
 
     def _quick_search(self, event: wx.CommandEvent) -> None:
@@ -1929,9 +1932,10 @@ class MainPanel(wx.ScrolledWindow):
         def _refresh_for(day: date) -> None:
             entries = self.controller.storage.get_entries_between(day, day)
             list_box.Clear()
+            # Every row is for ``day``; keep the ISO strings and reuse the known date.
             for row in entries:
                 (
-                    entry_date,
+                    _entry_date,
                     activity_name,
                     duration,
                     objectives,
@@ -1941,8 +1945,7 @@ class MainPanel(wx.ScrolledWindow):
                     comments,
                     plan_total,
                     plan_days,
-                    *extra,
-                ) = (*row,)
+                ) = row
                 per_day = (plan_total / plan_days) if plan_days else duration
                 idx = list_box.Append(
                     f"{activity_name}: {duration:.2f}h | plan {plan_total:.2f}h over {plan_days}d (~{per_day:.2f}h/d) {comments}"
@@ -1950,7 +1953,7 @@ class MainPanel(wx.ScrolledWindow):
                 list_box.SetClientData(
                     idx,
                     (
-                        date.fromisoformat(str(entry_date)),
+                        day,
                         activity_name,
                         duration,
                         objectives,
@@ -1996,28 +1999,34 @@ class MainPanel(wx.ScrolledWindow):
                 return
             data = Path(path).read_text(encoding="utf-8")
             cal_obj = Calendar(data)
+            activities = {a.name: a for a in self.controller.list_activities()}
+            rows = []
             for event_obj in cal_obj.events:
                 if not event_obj.begin:
                     continue
                 act_name = event_obj.name or "Imported task"
-                activity = next((a for a in self.controller.list_activities() if a.name == act_name), None)
+                activity = activities.get(act_name)
                 if activity is None:
-                    activity = self.controller.add_activity(act_name)
+                    activity = activities[act_name] = self.controller.add_activity(act_name)
                 duration_hours = 0.0
                 if event_obj.duration:
                     duration_hours = event_obj.duration.total_seconds() / 3600.0
-                self.controller.storage.upsert_daily_entry(
-                    event_obj.begin.date(),
-                    activity.id,
-                    duration_hours_delta=0.0,
-                    objectives_text=event_obj.description or "",
-                    target_hours=duration_hours,
-                    completion_percent=0.0,
-                    stop_reason="Calendar import",
-                    comments="Imported from calendar",
-                    plan_total_hours=duration_hours,
-                    plan_days=1,
+                rows.append(
+                    (
+                        event_obj.begin.date(),
+                        activity.id,
+                        0.0,
+                        event_obj.description or "",
+                        duration_hours,
+                        0.0,
+                        "Calendar import",
+                        "Imported from calendar",
+                        duration_hours,
+                        1,
+                    )
                 )
+            # One transaction for every event instead of a commit per entry.
+            self.controller.storage.upsert_daily_entries_bulk(rows)
             wx.MessageBox("Calendar imported", "Calendar import")
             on_day_changed(None)
 